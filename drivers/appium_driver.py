@@ -3,6 +3,8 @@ import json
 from appium import webdriver
 from appium.options.android import UiAutomator2Options
 
+from drivers.appium_server import AppiumServerManager
+from drivers.appium_transport import AppiumTransport
 from utils.file_manager import FileManager
 from utils.system_utils import SystemUtils
 from utils.logger import Logger
@@ -33,7 +35,7 @@ class AppiumDriverManager:
         application : str, optional
             Name of the application to test, as defined in `appium_config.yaml` (default is "calculator").
         """
-        self.config = SystemUtils.load_yaml("config/appium_config.yaml")
+        self.config = SystemUtils.get_appium_config()
         self.devices = SystemUtils.load_json("config/device_config.json")["devices"]
         self.logger = Logger.get_logger()
         # Get device automatically if device index isn't provided
@@ -47,9 +49,11 @@ class AppiumDriverManager:
         self.application = self.config["applications"][application]
         if not self.application:
             raise AppiumDriverManagerError(f"Application '{application}' not found in appium_config.yaml")
+        self.server = self.get_server()
         self.capabilities = self.set_capabilities()
         self.save_capabilities(self.capabilities)
         self.driver = None
+        self._transport_stats = None
         self._options = UiAutomator2Options().load_capabilities(self.capabilities)
 
     def save_capabilities(self, capabilities):
@@ -83,9 +87,39 @@ class AppiumDriverManager:
         capabilities = self.config["capabilities"].copy()
         capabilities.update(self.device)
         capabilities.update(self.application)
+        if self.server:
+            capabilities["systemPort"] = self.server["system_port"]
+            capabilities["chromedriverPort"] = self.server["chromedriver_port"]
         self.logger.debug(f"Capabilities: {capabilities}")
         return capabilities
 
+    def get_server(self):
+        """
+        Gets the Appium server dedicated to the current device from the server pool.
+
+        Returns
+        -------
+        dict or None
+            Server information, or None if the server pool is disabled in appium_config.yaml.
+        """
+        if not AppiumServerManager.is_enabled():
+            return None
+        return AppiumServerManager.get_server(self.device_name)
+
+    @property
+    def server_url(self):
+        """
+        Returns the URL of the Appium server used by the current device.
+
+        Returns
+        -------
+        str
+            The Appium server URL.
+        """
+        if self.server:
+            return self.server["url"]
+        return self.config["server"]["full_server_path"]
+
     @property
     def options(self):
         """
@@ -108,9 +142,11 @@ class AppiumDriverManager:
             The initialized Appium WebDriver instance.
         """
         try:
-            self.logger.info(f"Starting WebDriver: {self.config["server"]["full_server_path"]}")
-            self.driver = webdriver.Remote(command_executor=self.config["server"]["full_server_path"],
-                                           options=self.options)
+            self.logger.info(f"Starting WebDriver: {self.server_url}")
+            command_executor = AppiumTransport.create_connection(self.server_url)
+            if AppiumTransport.is_enabled():
+                self._transport_stats = AppiumTransport.get_stats(self.server_url)
+            self.driver = webdriver.Remote(command_executor=command_executor, options=self.options)
             return self.driver
         except Exception as e:
             raise AppiumDriverManagerError("Unable to start driver") from e
@@ -125,7 +161,11 @@ class AppiumDriverManager:
             If the driver fails to stop properly.
         """
         try:
-            self.logger.info(f"Stopping WebDriver: {self.config["server"]["full_server_path"]}")
+            self.logger.info(f"Stopping WebDriver: {self.server_url}")
             self.driver.quit()
+            if self._transport_stats:
+                transport_stats = AppiumTransport.format_stats(self._transport_stats,
+                                                               AppiumTransport.get_stats(self.server_url))
+                self.logger.info(f"HTTP transport: {transport_stats}")
         except Exception as e:
             raise AppiumDriverManagerError("Unable to stop driver") from e
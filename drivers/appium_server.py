@@ -0,0 +1,463 @@
+import os
+import json
+import time
+import shutil
+import signal
+import socket
+import threading
+import contextlib
+import subprocess
+import urllib.request
+
+try:
+    import fcntl
+except ImportError:
+    # fcntl is POSIX only, the state file is locked with msvcrt on Windows
+    fcntl = None
+    import msvcrt
+
+from utils.file_manager import FileManager
+from utils.system_utils import SystemUtils, SystemUtilsError
+from utils.logger import Logger
+
+
+class AppiumServerManagerError(Exception):
+    """
+    Custom exception for AppiumServerManager errors.
+    Used to handle specific issues related to the Appium server lifecycle.
+    """
+
+
+class AppiumServerManager:
+    """
+    Launches and supervises one Appium server per device.
+
+    Every device gets its own server port plus a dedicated UiAutomator2 `systemPort`
+    and `chromedriverPort`, all taken from the ranges defined in the `server_pool`
+    section of `appium_config.yaml`. Allocated servers are recorded in a state file,
+    so a healthy server left behind by a previous pytest run is reused instead of
+    launching a new one. The state file is locked while servers are allocated, so
+    concurrent pytest runs never hand out the same ports, and each entry lists the
+    pytest processes using the server, so a run never stops a server another run uses.
+    """
+    STATE_FILE = os.path.join(FileManager.BASE_REPORT_DIR, "appium_servers.json")
+    STATE_LOCK_FILE = os.path.join(FileManager.BASE_REPORT_DIR, "appium_servers.lock")
+    SERVER_LOG_DIR = os.path.join(FileManager.BASE_REPORT_DIR, "appium_servers/")
+    HEALTH_CHECK_TIMEOUT = 2
+    STARTING = "starting"
+    READY = "ready"
+
+    _servers = {}
+    _processes = {}
+    _device_locks = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_config(cls):
+        """
+        Returns the `server_pool` section of `appium_config.yaml`.
+
+        Returns
+        -------
+        dict
+            The server pool configuration, empty if the section is missing.
+        """
+        return SystemUtils.get_appium_config("server_pool")
+
+    @classmethod
+    def is_enabled(cls):
+        """
+        Checks if the per-device server pool is enabled.
+
+        Returns
+        -------
+        bool
+            True if each device should be routed to its own Appium server.
+        """
+        return bool(cls.get_config().get("enabled", False))
+
+    @classmethod
+    def get_server(cls, device_name):
+        """
+        Returns the Appium server assigned to a device, launching it if needed.
+
+        The ports are reserved in the state file under the lock, then the server is launched
+        and health-checked with the lock released, so servers of different devices and
+        pytest runs start in parallel. A server being started by another run is waited for.
+
+        Parameters
+        ----------
+        device_name : str
+            Name (adb serial) of the device.
+
+        Returns
+        -------
+        dict
+            Server information: `url`, `port`, `system_port`, `chromedriver_port`, `pid`, `status`
+            and the `users` (pytest processes using it).
+
+        Raises
+        ------
+        AppiumServerManagerError
+            If no free port is available or the server doesn't become ready in time.
+        """
+        with cls._lock:
+            device_lock = cls._device_locks.setdefault(device_name, threading.Lock())
+
+        with device_lock:
+            server = cls._servers.get(device_name)
+            if server and cls.is_healthy(server["url"]):
+                return server
+            cls._servers.pop(device_name, None)
+            # A server launched by this run that stopped answering is replaced
+            cls._stop_process(device_name)
+
+            startup_timeout = cls.get_config().get("startup_timeout", 60)
+            while True:
+                with cls._state_lock():
+                    state = cls._load_state()
+                    server = state.get(device_name)
+                    starting = (server and server.get("status") == cls.STARTING
+                                and time.time() - server.get("started_at", 0) < startup_timeout)
+                    if server and not starting and cls.is_healthy(server["url"]):
+                        server.setdefault("users", []).append(os.getpid())
+                        cls._save_state(state)
+                        Logger.get_logger().info(f"Reusing Appium server for {device_name}: {server['url']}")
+                        break
+                    if not starting:
+                        # A stale entry belongs to a server that is gone; its ports are free to reuse
+                        state.pop(device_name, None)
+                        server = cls._reserve(device_name, state)
+                        state[device_name] = server
+                        cls._save_state(state)
+                if not starting:
+                    cls._start(device_name, server, startup_timeout)
+                    break
+                # Another run is starting the server of this device
+                time.sleep(0.5)
+
+            cls._servers[device_name] = server
+            return server
+
+    @classmethod
+    def is_healthy(cls, url):
+        """
+        Checks if an Appium server answers its `/status` endpoint.
+
+        Parameters
+        ----------
+        url : str
+            Base URL of the Appium server.
+
+        Returns
+        -------
+        bool
+            True if the server is up and ready to create sessions.
+        """
+        try:
+            with urllib.request.urlopen(f"{url}/status", timeout=cls.HEALTH_CHECK_TIMEOUT) as response:
+                return response.status == 200
+        except (OSError, ValueError):
+            return False
+
+    @classmethod
+    def stop_server(cls, device_name):
+        """
+        Stops the Appium server assigned to a device and releases its ports.
+
+        Parameters
+        ----------
+        device_name : str
+            Name (adb serial) of the device.
+        """
+        with cls._state_lock():
+            state = cls._load_state()
+            server = cls._servers.pop(device_name, None) or state.get(device_name)
+            if device_name in cls._processes:
+                cls._stop_process(device_name)
+            elif server and server.get("pid"):
+                cls._terminate(server["pid"])
+            state.pop(device_name, None)
+            cls._save_state(state)
+
+    @classmethod
+    def release_server(cls, device_name):
+        """
+        Releases the Appium server used by this run for a device.
+
+        The server is only stopped if no other running pytest process uses it and
+        `keep_servers_alive` is disabled; otherwise it is left to the other runs.
+
+        Parameters
+        ----------
+        device_name : str
+            Name (adb serial) of the device.
+        """
+        with cls._state_lock():
+            state = cls._load_state()
+            cls._servers.pop(device_name, None)
+            server = state.get(device_name)
+            if server is None:
+                cls._stop_process(device_name)
+                return
+            users = [pid for pid in server.get("users", []) if pid != os.getpid() and cls._is_process_running(pid)]
+            if users or cls.get_config().get("keep_servers_alive", False):
+                server["users"] = users
+                # The server runs in its own session, it keeps running after this process exits
+                cls._processes.pop(device_name, None)
+            else:
+                if device_name in cls._processes:
+                    cls._stop_process(device_name)
+                elif server.get("pid"):
+                    cls._terminate(server["pid"])
+                state.pop(device_name)
+            cls._save_state(state)
+
+    @classmethod
+    def shutdown(cls):
+        """
+        Releases the servers used in this run, stopping those no other run uses
+        unless `keep_servers_alive` is enabled.
+        """
+        for device_name in list(cls._servers):
+            cls.release_server(device_name)
+
+    @classmethod
+    def _reserve(cls, device_name, state):
+        """
+        Reserves free ports for a new Appium server of a device.
+
+        Parameters
+        ----------
+        device_name : str
+            Name (adb serial) of the device.
+        state : dict
+            Servers currently recorded in the state file, whose ports are reserved.
+
+        Returns
+        -------
+        dict
+            Information of the server to launch, in the starting status.
+        """
+        config = cls.get_config()
+        host = config.get("host", "127.0.0.1")
+        base_path = config.get("base_path", "/wd/hub")
+        reserved = set()
+        for server in state.values():
+            reserved.update((server["port"], server["system_port"], server["chromedriver_port"]))
+
+        port = cls._allocate_port(host, config.get("port_range", [4723, 4772]), reserved)
+        reserved.add(port)
+        system_port = cls._allocate_port(host, config.get("system_port_range", [8200, 8299]), reserved)
+        reserved.add(system_port)
+        chromedriver_port = cls._allocate_port(host, config.get("chromedriver_port_range", [9515, 9614]), reserved)
+        return {
+            "url": f"http://{host}:{port}{base_path}",
+            "port": port,
+            "system_port": system_port,
+            "chromedriver_port": chromedriver_port,
+            "pid": None,
+            "status": cls.STARTING,
+            "started_at": time.time(),
+            "users": [os.getpid()],
+        }
+
+    @classmethod
+    def _start(cls, device_name, server, timeout):
+        """
+        Launches a reserved Appium server and waits until it is ready, without holding the state lock.
+
+        Raises
+        ------
+        AppiumServerManagerError
+            If the executable is missing or the server doesn't become ready; the reservation is released.
+        """
+        config = cls.get_config()
+        command = config.get("command", "appium")
+        try:
+            executable = shutil.which(command)
+            if not executable:
+                raise AppiumServerManagerError(f"Appium executable '{command}' not found in PATH")
+
+            os.makedirs(cls.SERVER_LOG_DIR, exist_ok=True)
+            log_path = os.path.join(cls.SERVER_LOG_DIR, f"appium-{device_name}-{server['port']}.log")
+            Logger.get_logger().info(f"Launching Appium server for {device_name} on port {server['port']}")
+            # The server runs in its own process group, so it is stopped with its children
+            if SystemUtils.get_os() == "Windows":
+                group_args = {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+            else:
+                group_args = {"start_new_session": True}
+            with open(log_path, "a") as log_file:
+                process = subprocess.Popen(
+                    [executable, "--address", config.get("host", "127.0.0.1"), "--port", str(server["port"]),
+                     "--base-path", config.get("base_path", "/wd/hub")],
+                    stdout=log_file, stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL, **group_args
+                )
+            cls._processes[device_name] = process
+            server["pid"] = process.pid
+            cls._wait_until_ready(server, process, timeout, log_path)
+        except AppiumServerManagerError:
+            cls._stop_process(device_name)
+            with cls._state_lock():
+                state = cls._load_state()
+                if state.get(device_name, {}).get("port") == server["port"]:
+                    state.pop(device_name)
+                    cls._save_state(state)
+            raise
+
+        with cls._state_lock():
+            state = cls._load_state()
+            server["status"] = cls.READY
+            entry = state.get(device_name)
+            if entry and entry.get("port") == server["port"]:
+                # Keep the runs that started to wait for this server meanwhile
+                server["users"] = sorted(set(server["users"]) | set(entry.get("users", [])))
+            state[device_name] = server
+            cls._save_state(state)
+
+    @classmethod
+    def _wait_until_ready(cls, server, process, timeout, log_path):
+        """
+        Polls the server status until it is ready or the timeout expires.
+
+        Raises
+        ------
+        AppiumServerManagerError
+            If the process exits or the server isn't ready before the timeout.
+        """
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise AppiumServerManagerError(
+                    f"Appium server on port {server['port']} exited with code {process.returncode}, see {log_path}")
+            if cls.is_healthy(server["url"]):
+                return
+            time.sleep(0.5)
+        raise AppiumServerManagerError(
+            f"Appium server on port {server['port']} not ready after {timeout}s, see {log_path}")
+
+    @classmethod
+    def _allocate_port(cls, host, port_range, reserved):
+        """
+        Returns the first port of a range that isn't reserved nor in use.
+
+        Raises
+        ------
+        AppiumServerManagerError
+            If every port in the range is taken.
+        """
+        first, last = port_range
+        for port in range(first, last + 1):
+            if port not in reserved and cls._is_port_free(host, port):
+                return port
+        raise AppiumServerManagerError(f"No free port available in range {first}-{last}")
+
+    @staticmethod
+    def _is_port_free(host, port):
+        """
+        Checks if a local port can be bound.
+        """
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            try:
+                sock.bind((host, port))
+                return True
+            except OSError:
+                return False
+
+    @classmethod
+    def _stop_process(cls, device_name):
+        """
+        Stops the server process launched by this run for a device and waits for it to exit.
+        """
+        process = cls._processes.pop(device_name, None)
+        if process is None:
+            return
+        cls._terminate(process.pid)
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            cls._terminate(process.pid, force=True)
+            process.wait()
+
+    @staticmethod
+    def _terminate(pid, force=False):
+        """
+        Terminates a server process and its children, ignoring processes already gone.
+
+        On Windows the launched executable is the `appium.cmd` wrapper, so the whole tree
+        is killed with `taskkill`; elsewhere the process group of the server is signaled.
+        """
+        try:
+            if SystemUtils.get_os() == "Windows":
+                SystemUtils.send_cmd(["taskkill", "/PID", str(pid), "/T", "/F"])
+            else:
+                os.killpg(pid, signal.SIGKILL if force else signal.SIGTERM)
+        except (OSError, SystemUtilsError):
+            pass
+
+    @staticmethod
+    def _is_process_running(pid):
+        """
+        Checks if a process is still running, to drop the runs that exited without releasing their servers.
+        """
+        if SystemUtils.get_os() == "Windows":
+            try:
+                return str(pid) in SystemUtils.send_cmd(["tasklist", "/FI", f"PID eq {pid}", "/NH"])
+            except SystemUtilsError:
+                return True
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
+
+    @classmethod
+    @contextlib.contextmanager
+    def _state_lock(cls):
+        """
+        Locks the state file against other pytest runs while servers are allocated or released.
+        """
+        os.makedirs(os.path.dirname(cls.STATE_LOCK_FILE), exist_ok=True)
+        with open(cls.STATE_LOCK_FILE, "a+") as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            else:
+                lock_file.seek(0)
+                # LK_LOCK gives up after 10 seconds, shorter than a server startup
+                while True:
+                    try:
+                        msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+                        break
+                    except OSError:
+                        time.sleep(0.1)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+                else:
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+    @classmethod
+    def _load_state(cls):
+        """
+        Loads the servers recorded by this and previous runs.
+        """
+        if not os.path.exists(cls.STATE_FILE):
+            return {}
+        try:
+            return SystemUtils.load_json(cls.STATE_FILE)
+        except ValueError:
+            return {}
+
+    @classmethod
+    def _save_state(cls, state):
+        """
+        Saves the servers currently allocated to the state file.
+        """
+        os.makedirs(os.path.dirname(cls.STATE_FILE), exist_ok=True)
+        with open(cls.STATE_FILE, "w") as f:
+            json.dump(state, f, indent=4)
@@ -0,0 +1,266 @@
+import time
+import threading
+
+import urllib3
+from appium.webdriver.appium_connection import AppiumConnection
+from selenium.webdriver.remote.client_config import ClientConfig
+
+from utils.system_utils import SystemUtils
+from utils.telemetry import Telemetry
+
+
+class MeteredPoolManager:
+    """
+    View of a shared urllib3 pool manager for one connection.
+
+    It adds the `Accept-Encoding` header of its connection to every request and records
+    the request time, the bytes sent and the response sizes, both on the wire and decoded,
+    in the counters of the server.
+    """
+    def __init__(self, pool_manager, stats, accept_encoding=None):
+        """
+        Initializes the view.
+
+        Parameters
+        ----------
+        pool_manager : urllib3.PoolManager
+            The pool shared by every connection to the server.
+        stats : dict
+            The counters of the server.
+        accept_encoding : str, optional
+            Value of the `Accept-Encoding` header, None to leave responses uncompressed.
+        """
+        self.pool_manager = pool_manager
+        self.stats = stats
+        self.accept_encoding = accept_encoding
+
+    def request(self, method, url, body=None, headers=None, **kwargs):
+        """
+        Sends a request through the shared pool and records its sizes.
+
+        Returns
+        -------
+        urllib3.BaseHTTPResponse
+            The response, with its content already decoded.
+        """
+        if self.accept_encoding:
+            headers = {**(headers or {}), "Accept-Encoding": self.accept_encoding}
+        start = time.perf_counter()
+        response = self.pool_manager.request(method, url, body=body, headers=headers, **kwargs)
+        elapsed = time.perf_counter() - start
+        decoded_bytes = len(response.data)
+        # Without Content-Length (chunked responses), tell() is the number of body bytes read from the socket
+        wire_bytes = int(response.headers.get("Content-Length") or response.tell())
+        compressed = response.headers.get("Content-Encoding", "identity") != "identity"
+        with SharedAppiumConnection._lock:
+            self.stats["requests"] += 1
+            self.stats["request_time"] += elapsed
+            self.stats["bytes"] += len(body) if body else 0
+            self.stats["response_wire_bytes"] += wire_bytes
+            self.stats["response_bytes"] += decoded_bytes
+            self.stats["compressed_responses"] += 1 if compressed else 0
+        return response
+
+    def clear(self):
+        """
+        Keeps the shared pool open, it is closed by `AppiumTransport.close_all()`.
+        """
+
+
+class TimedAppiumConnection(AppiumConnection):
+    """
+    AppiumConnection that publishes the round trip time of every command to the live telemetry.
+
+    It is the command executor of every session, with or without shared connections.
+    """
+    def _request(self, method, url, body=None):
+        """
+        Sends the request and publishes its round trip time to the live telemetry when it is enabled.
+        """
+        start = time.perf_counter()
+        try:
+            return super()._request(method, url, body=body)
+        finally:
+            Telemetry.emit("command", method, url, time.perf_counter() - start)
+
+
+class SharedAppiumConnection(TimedAppiumConnection):
+    """
+    AppiumConnection whose keep-alive HTTP pool is shared by every session to the same server.
+
+    Selenium builds a new pool for each `webdriver.Remote` and clears it on `quit()`,
+    so every test pays for new TCP connections. Here the pool is created once per
+    server URL and kept open until `AppiumTransport.close_all()` is called.
+    """
+    _pools = {}
+    _stats = {}
+    _lock = threading.Lock()
+
+    def __init__(self, client_config, accept_encoding=None):
+        """
+        Initializes the connection.
+
+        Parameters
+        ----------
+        client_config : ClientConfig
+            The client configuration, with `keep_alive` enabled.
+        accept_encoding : str, optional
+            Value of the `Accept-Encoding` header of this connection, None to leave responses uncompressed.
+        """
+        # Read by _get_connection_manager, called from the parent constructor
+        self.accept_encoding = accept_encoding
+        super().__init__(client_config=client_config)
+
+    @staticmethod
+    def new_stats():
+        """
+        Returns zeroed transport counters.
+        """
+        return {"requests": 0, "request_time": 0.0, "bytes": 0, "response_wire_bytes": 0, "response_bytes": 0,
+                "compressed_responses": 0}
+
+    def _get_connection_manager(self):
+        """
+        Returns a view of the pool shared by all the connections to the same server.
+        """
+        server_url = self._client_config.remote_server_addr
+        with self._lock:
+            if server_url not in self._pools:
+                self._pools[server_url] = super()._get_connection_manager()
+                self._stats[server_url] = self.new_stats()
+            return MeteredPoolManager(self._pools[server_url], self._stats[server_url], self.accept_encoding)
+
+    def close(self):
+        """
+        Keeps the shared pool open when a session quits, so the next session reuses its connections.
+        """
+
+
+class AppiumTransport:
+    """
+    Configurable HTTP transport for the Appium commands.
+
+    Reads the `transport` section of `appium_config.yaml` and creates timed connections
+    with configurable timeouts and retries that, when enabled, share keep-alive pools
+    per server with optional response compression.
+    """
+    @classmethod
+    def get_config(cls):
+        """
+        Returns the `transport` section of `appium_config.yaml`.
+
+        Returns
+        -------
+        dict
+            The transport configuration, empty if the section is missing.
+        """
+        return SystemUtils.get_appium_config("transport")
+
+    @classmethod
+    def is_enabled(cls):
+        """
+        Checks if sessions should share keep-alive connections.
+
+        Returns
+        -------
+        bool
+            True if the shared transport is enabled.
+        """
+        return bool(cls.get_config().get("shared_connections", False))
+
+    @classmethod
+    def create_connection(cls, server_url):
+        """
+        Creates a timed connection to an Appium server, reusing the server's shared pool when enabled.
+
+        Parameters
+        ----------
+        server_url : str
+            URL of the Appium server.
+
+        Returns
+        -------
+        TimedAppiumConnection
+            The command executor to pass to `webdriver.Remote`, a `SharedAppiumConnection`
+            if shared connections are enabled.
+        """
+        config = cls.get_config()
+        pool_args = {
+            "maxsize": config.get("pool_maxsize", 4),
+            "retries": urllib3.Retry(
+                total=config.get("retries", 2),
+                backoff_factor=config.get("backoff_factor", 0.5),
+                raise_on_status=False
+            ),
+        }
+        client_config = ClientConfig(
+            remote_server_addr=server_url,
+            keep_alive=True,
+            timeout=urllib3.Timeout(connect=config.get("connect_timeout", 10), read=config.get("read_timeout", 120)),
+            init_args_for_pool_manager={"init_args_for_pool_manager": pool_args},
+        )
+        if not cls.is_enabled():
+            return TimedAppiumConnection(client_config=client_config)
+        accept_encoding = "gzip, deflate" if config.get("compression", False) else None
+        return SharedAppiumConnection(client_config=client_config, accept_encoding=accept_encoding)
+
+    @classmethod
+    def get_stats(cls, server_url):
+        """
+        Returns the transport counters of an Appium server.
+
+        Parameters
+        ----------
+        server_url : str
+            URL of the Appium server.
+
+        Returns
+        -------
+        dict
+            `requests` sent, `connections` opened, `request_time` in seconds, request `bytes` sent,
+            `response_wire_bytes` received, `response_bytes` once decoded and `compressed_responses`.
+        """
+        pool_manager = SharedAppiumConnection._pools.get(server_url)
+        if pool_manager is None:
+            return {**SharedAppiumConnection.new_stats(), "connections": 0}
+        with SharedAppiumConnection._lock:
+            stats = dict(SharedAppiumConnection._stats[server_url])
+        stats["connections"] = pool_manager.connection_from_url(server_url).num_connections
+        return stats
+
+    @staticmethod
+    def format_stats(before, after):
+        """
+        Summarizes the transport activity between two `get_stats` snapshots.
+
+        Parameters
+        ----------
+        before : dict
+            Counters taken at the start of the session.
+        after : dict
+            Counters taken at the end of the session.
+
+        Returns
+        -------
+        str
+            Human readable summary for the test logs.
+        """
+        delta = {key: after[key] - before[key] for key in after}
+        requests = delta["requests"]
+        average = delta["request_time"] / requests * 1000 if requests else 0.0
+        return (f"{requests} requests, {max(requests - delta['connections'], 0)} over reused connections, "
+                f"{delta['connections']} new connections, {delta['bytes']} bytes sent, "
+                f"{delta['response_wire_bytes']} bytes received ({delta['response_bytes']} decoded, "
+                f"{delta['compressed_responses']} compressed responses), "
+                f"{average:.1f} ms average round trip")
+
+    @staticmethod
+    def close_all():
+        """
+        Closes every shared pool. Called at the end of the test session.
+        """
+        with SharedAppiumConnection._lock:
+            for pool_manager in SharedAppiumConnection._pools.values():
+                pool_manager.clear()
+            SharedAppiumConnection._pools.clear()
+            SharedAppiumConnection._stats.clear()
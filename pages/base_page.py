@@ -1,3 +1,6 @@
+from utils.visual_comparator import VisualComparator
+
+
 class BasePageError(Exception):
     """
     Custom exception for BasePage errors.
@@ -89,3 +92,85 @@ class BasePage:
         """
         element = self.find_element(locator_type, locator_value)
         return element.text
+
+    def get_element_region(self, locator_type, locator_value):
+        """
+        Gets the screen region of an element, to be ignored in visual comparisons.
+
+        Parameters
+        ----------
+        locator_type : AppiumBy
+            The type of locator.
+        locator_value : str
+            The locator value.
+
+        Returns
+        -------
+        tuple
+            The region (x, y, width, height) in screenshot pixels.
+        """
+        rect = self.find_element(locator_type, locator_value).rect
+        return rect["x"], rect["y"], rect["width"], rect["height"]
+
+    def get_status_bar_region(self):
+        """
+        Gets the screen region of the status bar, whose clock and icons change between runs.
+
+        Returns
+        -------
+        tuple
+            The region (x, y, width, height) in screenshot pixels.
+        """
+        status_bar = self.driver.get_system_bars()["statusBar"]
+        return status_bar["x"], status_bar["y"], status_bar["width"], status_bar["height"]
+
+    def compare_with_baseline(self, name, ignore_regions=None, pixel_threshold=16):
+        """
+        Compares the current screen against its stored baseline.
+
+        Parameters
+        ----------
+        name : str
+            Name of the screen baseline in `data/baselines/`.
+        ignore_regions : list of tuple, optional
+            Regions (x, y, width, height) excluded from the comparison, e.g. the status bar.
+        pixel_threshold : int, optional
+            Maximum per channel difference for a pixel to be considered equal (default is 16).
+
+        Returns
+        -------
+        dict
+            The comparison result, see `VisualComparator.compare`.
+        """
+        return VisualComparator.compare(self.driver.get_screenshot_as_png(), name,
+                                        ignore_regions=ignore_regions, pixel_threshold=pixel_threshold)
+
+    def assert_matches_baseline(self, name, tolerance=0.001, ignore_regions=None, pixel_threshold=16):
+        """
+        Asserts that the current screen matches its stored baseline.
+
+        Parameters
+        ----------
+        name : str
+            Name of the screen baseline in `data/baselines/`.
+        tolerance : float, optional
+            Maximum share of compared pixels allowed to differ (default is 0.001).
+        ignore_regions : list of tuple, optional
+            Regions (x, y, width, height) excluded from the comparison.
+        pixel_threshold : int, optional
+            Maximum per channel difference for a pixel to be considered equal (default is 16).
+
+        Raises
+        ------
+        AssertionError
+            If the share of differing pixels exceeds the tolerance. The screenshot with the
+            differing pixels highlighted is saved in the screenshots folder.
+        VisualComparatorError
+            If the screen has no baseline for the screenshot resolution.
+        """
+        result = self.compare_with_baseline(name, ignore_regions=ignore_regions, pixel_threshold=pixel_threshold)
+        if result["diff_ratio"] > tolerance:
+            VisualComparator.save_diff(result["image"], result["diff_mask"], name)
+        assert result["diff_ratio"] <= tolerance, (
+            f"Screen '{name}' differs from baseline {result['baseline']}: "
+            f"{result['diff_ratio']:.4%} of pixels ({result['diff_pixels']}) exceed the tolerance of {tolerance:.4%}")
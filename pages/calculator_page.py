@@ -81,3 +81,19 @@ class CalculatorPage(BasePage):
             The displayed result.
         """
         return self.get_text(*CalculatorLocators.get_empty_result())
+
+    def assert_layout(self, name="calculator_layout", tolerance=0.001):
+        """
+        Asserts that the calculator screen matches its baseline.
+        The status bar and the display are ignored, as their content changes between runs.
+
+        Parameters
+        ----------
+        name : str, optional
+            Name of the screen baseline (default is "calculator_layout").
+        tolerance : float, optional
+            Maximum share of compared pixels allowed to differ (default is 0.001).
+        """
+        ignore_regions = [self.get_status_bar_region(),
+                          self.get_element_region(*CalculatorLocators.get_empty_result())]
+        self.assert_matches_baseline(name, tolerance=tolerance, ignore_regions=ignore_regions)
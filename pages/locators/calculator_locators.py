@@ -16,6 +16,28 @@ class CalculatorLocators:
     BASE_BTN_ID = "com.google.android.calculator:id/{button}"
     RESULT_ID = "com.google.android.calculator:id/result_final"
     EMPTY_RESULT_ID = "com.google.android.calculator:id/formula"
+    NUMERIC_MAP = {
+        0: "zero",
+        1: "one",
+        2: "two",
+        3: "three",
+        4: "four",
+        5: "five",
+        6: "six",
+        7: "seven",
+        8: "eight",
+        9: "nine"
+    }
+    OPERATOR_MAP = {
+        "+": "op_add",
+        "-": "op_sub",
+        "*": "op_mul",
+        "/": "op_div",
+        "=": "eq",
+        "C": "clr"
+    }
+    # Only shown once a result is computed; the launch screen has the delete button instead
+    STATE_DEPENDENT_LOCATORS = {"result", "operator C"}
 
     @classmethod
     def get_numeric_locator(cls, number):
@@ -32,19 +54,7 @@ class CalculatorLocators:
         Tuple
             The locator tuple (AppiumBy.XPATH, formatted locator).
         """
-        numeric_map = {
-            0: "zero",
-            1: "one",
-            2: "two",
-            3: "three",
-            4: "four",
-            5: "five",
-            6: "six",
-            7: "seven",
-            8: "eight",
-            9: "nine"
-        }
-        if number not in numeric_map:
+        if number not in cls.NUMERIC_MAP:
             raise CalculatorLocatorsError(f"Invalid number: {number}. Allowed: 0, 1, 2, 3, 4, etc.")
         return AppiumBy.XPATH, cls.BASE_BTN_XPATH.format(button=number)
 
@@ -67,17 +77,9 @@ class CalculatorLocators:
         -------
 
         """
-        operator_map = {
-            "+": "op_add",
-            "-": "op_sub",
-            "*": "op_mul",
-            "/": "op_div",
-            "=": "eq",
-            "C": "clr"
-        }
-        if operator not in operator_map:
+        if operator not in cls.OPERATOR_MAP:
             raise CalculatorLocatorsError(f"Invalid operator: {operator}. Allowed: +, -, *, /, =, C")
-        return AppiumBy.ID, cls.BASE_BTN_ID.format(button=operator_map[operator])
+        return AppiumBy.ID, cls.BASE_BTN_ID.format(button=cls.OPERATOR_MAP[operator])
 
     @classmethod
     def get_result_locator(cls):
@@ -102,3 +104,19 @@ class CalculatorLocators:
             The locator tuple (AppiumBy.ID, RESULT_ID).
         """
         return AppiumBy.ID, cls.EMPTY_RESULT_ID
+
+    @classmethod
+    def get_all_locators(cls):
+        """
+        Returns every locator this class can produce, used by the locator preflight.
+
+        Returns:
+        --------
+        dict
+            Locator name mapped to its locator tuple.
+        """
+        locators = {f"number {number}": cls.get_numeric_locator(number) for number in cls.NUMERIC_MAP}
+        locators.update({f"operator {operator}": cls.get_operator_locator(operator) for operator in cls.OPERATOR_MAP})
+        locators["result"] = cls.get_result_locator()
+        locators["empty result"] = cls.get_empty_result()
+        return locators
@@ -1,26 +1,73 @@
 import pytest
 import sys
 import os
+import time
 
 from utils.logger import Logger
-from utils.system_utils import SystemUtils
+from utils.system_utils import SystemUtils, SystemUtilsError
 from utils.file_manager import FileManager
 from drivers.appium_driver import AppiumDriverManager
+from drivers.appium_server import AppiumServerManager
+from drivers.appium_transport import AppiumTransport
+from pages.locators.calculator_locators import CalculatorLocators
+from utils.locator_validator import LocatorValidator, LocatorValidatorError
+from utils.framework_profiler import FrameworkProfiler
+from utils.soak_runner import SoakRunner
+from utils.telemetry import Telemetry
+from utils.visual_comparator import VisualComparator
 
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
+# Locator classes validated against the first screen of each application
+PREFLIGHT_LOCATORS = {
+    "calculator": [CalculatorLocators],
+}
+
+
+def pytest_addoption(parser):
+    """
+    Hook to register the command line options of the framework.
+    """
+    parser.addoption("--update-baselines", action="store_true", default=False,
+                     help="Record the screenshots of the visual assertions as their baselines instead of comparing")
+    parser.addoption("--no-locator-preflight", action="store_true", default=False,
+                     help="Skip the validation of the locator classes at session start")
+    parser.addoption("--profile-framework", action="store_true", default=False,
+                     help="Profile the framework Python time of each test, separated from the device time")
+    parser.addoption("--profile-interval", action="store", type=float, default=5,
+                     help="Sampling interval of --profile-framework in milliseconds (default is 5)")
+    parser.addoption("--soak-duration", action="store", type=float, default=None,
+                     help="Run the soak tests for the given minutes")
+    parser.addoption("--soak-iterations", action="store", type=int, default=None,
+                     help="Run the soak tests for the given number of iterations")
+    parser.addoption("--soak-interval", action="store", type=float, default=5.0,
+                     help="Seconds between device resource samples in soak tests (default is 5)")
+    parser.addoption("--telemetry-port", action="store", type=int, default=None,
+                     help="Serve live run telemetry on http://127.0.0.1:<port> (/metrics, /stream), 0 for any free port")
+
+
+def pytest_collection_modifyitems(config, items):
+    """
+    Hook to skip the soak tests unless a soak duration or number of iterations is given.
+    """
+    if config.getoption("soak_duration") is not None or config.getoption("soak_iterations") is not None:
+        return
+    skip_soak = pytest.mark.skip(reason="Soak mode disabled, use --soak-duration or --soak-iterations")
+    for item in items:
+        if "soak" in item.keywords:
+            item.add_marker(skip_soak)
+
 
 @pytest.fixture(scope="function")
-def driver(request):
+def driver_manager(request):
     """
-    Fixture to initialize and return an Appium WebDriver instance.
-    Ensures proper setup and teardown of the driver.
+    Fixture to set up the execution folder and return the Appium driver manager of the test.
 
-    Yields
-    ------
-    WebDriver
-        The initialized Appium WebDriver instance.
+    Returns
+    -------
+    AppiumDriverManager
+        The driver manager of the current device.
     """
     test_name = request.node.name
 
@@ -29,18 +76,73 @@ def driver(request):
     Logger.setup_logger(test_name=test_name)
 
     driver_manager = AppiumDriverManager(application="calculator")
+    Telemetry.emit("device", request.node.nodeid, driver_manager.device_name)
+    return driver_manager
+
+
+@pytest.fixture(scope="function")
+def driver(driver_manager, request):
+    """
+    Fixture to initialize and return an Appium WebDriver instance.
+    Ensures proper setup and teardown of the driver.
+
+    Yields
+    ------
+    WebDriver
+        The initialized Appium WebDriver instance.
+    """
     driver_instance = driver_manager.start_driver()
+
+    if not request.config.getoption("no_locator_preflight"):
+        try:
+            LocatorValidator.preflight(driver_instance, PREFLIGHT_LOCATORS["calculator"])
+        except LocatorValidatorError as e:
+            driver_manager.stop_driver()
+            pytest.fail(str(e), pytrace=False)
+
     yield driver_instance
     driver_manager.stop_driver()
 
 
+@pytest.fixture(scope="function")
+def soak_runner(driver, driver_manager, request):
+    """
+    Fixture to return a SoakRunner configured from the --soak-* options.
+
+    Returns
+    -------
+    SoakRunner
+        The soak runner for the current driver.
+    """
+    duration = request.config.getoption("soak_duration")
+    return SoakRunner(driver, driver_manager.device_name, driver_manager.application["appPackage"],
+                      duration=duration * 60 if duration is not None else None,
+                      iterations=request.config.getoption("soak_iterations"),
+                      sample_interval=request.config.getoption("soak_interval"))
+
+
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_protocol(item):
     """
-    Hook to capture the current test name in execution
+    Hook to capture the current test name in execution.
+    With --profile-framework, it also profiles the whole test protocol (setup, call and teardown)
+    and writes the profile into the execution folder.
     """
     pytest.current_test = item.nodeid
+    if not item.config.getoption("profile_framework"):
+        yield
+        return
+
+    execution_dir = FileManager.EXECUTION_DIR
+    profiler = FrameworkProfiler(interval=item.config.getoption("profile_interval") / 1000)
+    profiler.start()
     yield
+    profiler.stop()
+    # Tests without the driver fixture don't create an execution folder
+    if FileManager.EXECUTION_DIR == execution_dir:
+        profiler.save(os.path.join(FileManager.SUITE_DIR, f"{item.name}-profile"), item.name)
+    else:
+        profiler.save(FileManager.EXECUTION_DIR, item.name)
 
 
 @pytest.hookimpl(tryfirst=True)
@@ -51,7 +153,11 @@ def pytest_configure(config):
     using the device name obtained from AppiumDriverManager.
     """
 
-    device_name = SystemUtils.get_device_from_adb()["deviceName"]
+    try:
+        device_name = SystemUtils.get_device_from_adb()["deviceName"]
+    except SystemUtilsError:
+        # Unit tests run without a device; device tests still fail when their driver starts
+        device_name = "no_device"
     FileManager.setup_suite_folder(device_name=device_name)
     suite_dir = FileManager.SUITE_DIR
 
@@ -62,3 +168,63 @@ def pytest_configure(config):
     # add destination path to plugins options
     config.option.json_report_file = json_report_path
     config.option.htmlpath = html_report_path
+
+    VisualComparator.update_baselines = config.getoption("update_baselines")
+
+    telemetry_port = config.getoption("telemetry_port")
+    if telemetry_port is not None:
+        config.telemetry_url = Telemetry.start(port=telemetry_port)
+
+
+def pytest_sessionstart(session):
+    """
+    Hook to show the live telemetry endpoints once the terminal reporter is set up.
+    """
+    telemetry_url = getattr(session.config, "telemetry_url", None)
+    terminal_reporter = session.config.pluginmanager.get_plugin("terminalreporter")
+    if telemetry_url and terminal_reporter:
+        terminal_reporter.write_line(f"Live telemetry available at {telemetry_url}/metrics and {telemetry_url}/stream")
+
+
+def pytest_collection_finish(session):
+    """
+    Hook to publish the number of collected tests to the live telemetry.
+    """
+    Telemetry.emit("collected", len(session.items))
+
+
+def pytest_runtest_logstart(nodeid, location):
+    """
+    Hook to publish the start of a test to the live telemetry.
+    """
+    Telemetry.emit("started", nodeid, time.time())
+
+
+def pytest_runtest_logreport(report):
+    """
+    Hook to publish the outcome of a test to the live telemetry.
+    Failures outside the test call (setup or teardown) are counted as errors.
+    """
+    if report.when == "call" or report.outcome != "passed":
+        if report.outcome == "failed" and report.when != "call":
+            Telemetry.emit("outcome", "errors")
+        else:
+            Telemetry.emit("outcome", report.outcome)
+
+
+def pytest_runtest_logfinish(nodeid, location):
+    """
+    Hook to publish the end of a test to the live telemetry.
+    """
+    Telemetry.emit("finished", nodeid)
+
+
+def pytest_unconfigure(config):
+    """
+    Hook that runs at the end of the test session.
+    It stops the live telemetry, closes the shared HTTP connections and tears down the Appium servers
+    launched for the devices used in the run.
+    """
+    Telemetry.stop()
+    AppiumTransport.close_all()
+    AppiumServerManager.shutdown()
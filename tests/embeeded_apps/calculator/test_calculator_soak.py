@@ -0,0 +1,35 @@
+import pytest
+
+from pages.calculator_page import CalculatorPage
+
+
+@pytest.mark.soak
+def test_calculator_expressions_soak(soak_runner, driver):
+    """
+    Soak test of the calculator.
+    Loops additions and clears while the app memory, CPU and frames are sampled,
+    and ensures that no iteration fails and the memory doesn't grow monotonically.
+    The leak check needs memory samples of the app and at least 4 windows to compare.
+    """
+    calculator_page = CalculatorPage(driver)
+
+    def flow(iteration):
+        first, second = iteration % 10, (iteration * 7) % 10
+        calculator_page.press_number(first)
+        calculator_page.press_operator("+")
+        calculator_page.press_number(second)
+        calculator_page.press_equal()
+        result = calculator_page.get_result()
+        assert result == str(first + second), f"Expected {first + second}, but got {result}"
+        calculator_page.clear_calculator()
+
+    summary = soak_runner.run(flow)
+
+    assert summary["failures"] == 0, f"{summary['failures']} iterations failed: {summary['first_failures']}"
+    resources = summary["resources"]
+    assert resources["samples"] > 0, \
+        f"No memory sample of the app was taken ({resources['failed_samples']} failed), see {resources['time_series']}"
+    assert resources["memory"]["windows"] >= 4, \
+        f"Only {resources['memory']['windows']} memory windows sampled, increase the soak duration or iterations"
+    assert not resources["memory"]["leak_suspected"], \
+        f"Monotonic memory growth detected: {resources['memory']}"
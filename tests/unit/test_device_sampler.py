@@ -0,0 +1,114 @@
+import random
+
+from utils.device_sampler import DeviceResourceSampler, MemoryTrend
+from utils.system_utils import SystemUtils
+
+
+def feed(trend, values, interval=5.0):
+    """
+    Adds a series of memory samples taken every interval seconds.
+    """
+    for index, value in enumerate(values):
+        trend.add(index * interval, value)
+    return trend.get_result()
+
+
+def test_memory_trend_flat():
+    """
+    Test a constant memory use.
+    Ensures that no growth nor leak is reported.
+    """
+    result = feed(MemoryTrend(window=4), [100000] * 40)
+
+    assert result["slope_kb_per_hour"] == 0.0
+    assert result["growth_kb"] == 0.0
+    assert result["monotonic_ratio"] == 0.0
+    assert not result["leak_suspected"]
+
+
+def test_memory_trend_noisy_flat():
+    """
+    Test a memory use oscillating around a constant value, like the garbage collector does.
+    Ensures that the noise isn't reported as a leak.
+    """
+    noise = random.Random(0)
+    result = feed(MemoryTrend(window=4), [100000 + noise.uniform(-3000, 3000) for _ in range(400)])
+
+    assert abs(result["growth_kb"]) < 3000
+    assert abs(result["slope_kb_per_hour"]) < 5000
+    assert result["monotonic_ratio"] < 0.8
+    assert not result["leak_suspected"]
+
+
+def test_memory_trend_steady_growth():
+    """
+    Test a memory use growing by 100 KB every sample.
+    Ensures that the growth, the slope and the leak are reported.
+    """
+    # 100 KB every 5 seconds is 72000 KB per hour
+    result = feed(MemoryTrend(window=4), [100000 + 100 * index for index in range(80)])
+
+    assert result["slope_kb_per_hour"] == 72000.0
+    # The first window averages samples 0-3 and the last one samples 76-79
+    assert result["growth_kb"] == 7600.0
+    assert result["monotonic_ratio"] == 1.0
+    assert result["leak_suspected"]
+
+
+def test_memory_trend_growth_below_minimum():
+    """
+    Test a monotonic growth smaller than the minimum growth.
+    Ensures that a small warm-up growth isn't reported as a leak.
+    """
+    result = feed(MemoryTrend(window=4, min_growth_kb=5120), [100000 + 10 * index for index in range(80)])
+
+    assert result["monotonic_ratio"] == 1.0
+    assert result["growth_kb"] == 760.0
+    assert not result["leak_suspected"]
+
+
+def test_memory_trend_bounded_windows():
+    """
+    Test a run longer than the kept windows.
+    Ensures that only the last windows are kept while the growth is measured from the first one.
+    """
+    trend = MemoryTrend(window=2, max_windows=5)
+    result = feed(trend, [100000 + 1000 * index for index in range(40)])
+
+    assert len(trend.windows) == 5
+    assert result["growth_kb"] == 38000.0
+    assert result["leak_suspected"]
+
+
+def test_memory_trend_windows():
+    """
+    Test a run shorter than a window.
+    Ensures that only completed windows are counted and no leak is reported without them.
+    """
+    assert feed(MemoryTrend(window=4), [100000 + 10000 * index for index in range(3)])["windows"] == 0
+    result = feed(MemoryTrend(window=4), [100000 + 10000 * index for index in range(14)])
+
+    assert result["windows"] == 3
+    assert not result["leak_suspected"]
+
+
+def test_sampler_counts_memory_samples(monkeypatch, tmp_path):
+    """
+    Test samples of an app that isn't running, then of a running app.
+    Ensures that only the samples with the app memory are counted.
+    """
+    outputs = {"dumpsys meminfo": "No process found for: com.example\n", "cat /proc": "", "dumpsys gfxinfo": ""}
+    monkeypatch.setattr(SystemUtils, "adb_shell", lambda device_name, command: next(
+        output for prefix, output in outputs.items() if command.startswith(prefix)))
+    sampler = DeviceResourceSampler("emulator-5554", "com.example", str(tmp_path / "resources.csv"))
+    sampler.start()
+    sampler.stop()
+    sampler.take_sample()
+    assert sampler.get_summary()["samples"] == 0
+
+    outputs["dumpsys meminfo"] = "                   TOTAL PSS:    52000            TOTAL RSS:   98000\n"
+    sampler.take_sample()
+    summary = sampler.get_summary()
+
+    assert summary["samples"] == 1
+    assert summary["peak_pss_kb"] == 52000
@@ -0,0 +1,72 @@
+import os
+
+import pytest
+
+from utils.framework_profiler import FrameworkProfiler
+
+HOOKWRAPPER = "pluggy/_callers.py:_multicall;" + os.path.join("tests", "conftest.py") + ":pytest_runtest_protocol"
+PYTEST_CALL = "_pytest/runner.py:pytest_runtest_call;_pytest/python.py:pytest_pyfunc_call"
+TEST = os.path.join("tests", "test_calculator.py") + ":TestCalculator.test_add"
+PAGE = os.path.join("pages", "calculator_page.py") + ":CalculatorPage.press"
+FIXTURE = os.path.join("tests", "conftest.py") + ":driver"
+
+
+def summarize(samples):
+    """
+    Builds the summary of synthetic folded stacks below the profiling hookwrapper,
+    with one sample per millisecond.
+    """
+    profiler = FrameworkProfiler()
+    for stack, count in samples.items():
+        profiler.samples[f"{HOOKWRAPPER};{stack}"] += count
+    profiler.wall_time = sum(samples.values()) / 1000
+    return profiler.get_summary()
+
+
+def test_profiler_excludes_hookwrapper():
+    """
+    Test samples spent in pytest and in the profiler below the profiling hookwrapper.
+    Ensures that the hookwrapper and the profiler aren't counted as framework time.
+    """
+    summary = summarize({
+        "_pytest/runner.py:call_and_report": 60,
+        f"{os.path.join('utils', 'framework_profiler.py')}:FrameworkProfiler.stop": 40,
+    })
+
+    assert summary["python_time"] == pytest.approx(0.1)
+    assert summary["framework_time"] == 0.0
+    assert summary["functions"] == {}
+
+
+def test_profiler_exclusive_framework_time():
+    """
+    Test samples whose leaf is a framework frame, or a library it calls, next to device waits.
+    Ensures that only the Python time of the framework is counted as framework time.
+    """
+    summary = summarize({
+        f"{PYTEST_CALL};{TEST};{PAGE}": 10,
+        f"{PYTEST_CALL};{TEST};{PAGE};json/encoder.py:JSONEncoder.encode": 5,
+        f"{PYTEST_CALL};{TEST};{PAGE};{FrameworkProfiler.APPIUM_WAIT}": 70,
+        f"{PYTEST_CALL};{TEST};subprocess.py:run;{FrameworkProfiler.ADB_WAIT}": 15,
+    })
+
+    assert summary["appium_time"] == pytest.approx(0.07)
+    assert summary["adb_time"] == pytest.approx(0.015)
+    assert summary["python_time"] == pytest.approx(0.015)
+    assert summary["framework_time"] == pytest.approx(0.015)
+    assert summary["functions"] == {TEST: pytest.approx(0.015), PAGE: pytest.approx(0.015)}
+
+
+def test_profiler_runner_below_framework_frame():
+    """
+    Test samples where a framework frame calls back into pytest, e.g. to resolve a fixture.
+    Ensures that the time spent in pytest isn't counted as framework time.
+    """
+    summary = summarize({
+        f"{FIXTURE};_pytest/fixtures.py:FixtureRequest.getfixturevalue": 30,
+        f"{FIXTURE}": 10,
+    })
+
+    assert summary["python_time"] == pytest.approx(0.04)
+    assert summary["framework_time"] == pytest.approx(0.01)
+    assert summary["functions"] == {FIXTURE: pytest.approx(0.04)}
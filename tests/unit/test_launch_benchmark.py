@@ -0,0 +1,174 @@
+import pytest
+
+from utils.system_utils import SystemUtils
+from utils.launch_benchmark import LaunchBenchmark
+
+
+CALCULATOR = {"appPackage": "com.example", "appActivity": ".Main"}
+
+
+@pytest.fixture
+def benchmark(monkeypatch):
+    """
+    Fixture to return a LaunchBenchmark that doesn't look for connected devices.
+    """
+    monkeypatch.setattr(SystemUtils, "list_adb_devices", staticmethod(lambda: []))
+    return LaunchBenchmark(threshold=0.1, min_delta_ms=20)
+
+
+@pytest.fixture
+def adb(monkeypatch):
+    """
+    Fixture to fake the adb shell of a device where BACK keeps the activity, like Android 12+.
+    Returns the device properties, e.g. to change its API level.
+    """
+    device = {"sdk": "33", "launch_state": "COLD"}
+    launch_states = {"am force-stop": "COLD", "input keyevent KEYCODE_BACK": "HOT", "input keyevent KEYCODE_HOME": "HOT"}
+
+    def adb_shell(device_name, command):
+        if command.startswith("dumpsys package"):
+            return "    versionCode=7 minSdk=29\n    versionName=1.2"
+        if command.startswith("getprop"):
+            return device["sdk"]
+        if command.startswith("am start"):
+            return f"Status: ok\nLaunchState: {device['launch_state']}\nTotalTime: 300\nComplete"
+        device["launch_state"] = next(state for prefix, state in launch_states.items() if command.startswith(prefix))
+        return ""
+
+    monkeypatch.setattr(SystemUtils, "adb_shell", staticmethod(adb_shell))
+    return device
+
+
+def make_record(build, medians, device="emulator-5554", application="calculator"):
+    """
+    Builds a benchmark record with the given median launch time per mode.
+    """
+    return {
+        "device": device,
+        "application": application,
+        "build": build,
+        "modes": {mode: {"stats": {"median": median}} for mode, median in medians.items()},
+    }
+
+
+def test_compute_stats():
+    """
+    Test the statistics of a list of launch times.
+    Ensures that the order of the samples doesn't matter.
+    """
+    stats = LaunchBenchmark.compute_stats([500, 300, 400, 310, 320, 330, 340, 350, 360, 370])
+
+    assert stats["min"] == 300
+    assert stats["median"] == 345.0
+    assert stats["mean"] == 358.0
+    assert stats["p90"] == 400
+    assert stats["max"] == 500
+    assert stats["stdev"] == 58.1
+
+
+def test_compute_stats_single_sample():
+    """
+    Test the statistics of a single launch time.
+    Ensures that the deviation is 0 instead of failing.
+    """
+    stats = LaunchBenchmark.compute_stats([420])
+
+    assert stats["min"] == stats["median"] == stats["p90"] == stats["max"] == 420
+    assert stats["stdev"] == 0.0
+
+
+def test_compare_regression(benchmark):
+    """
+    Test a launch time increase above both the relative and the absolute thresholds.
+    Ensures that it is flagged as regression against the previous build.
+    """
+    history = [make_record("1.0 (1)", {"cold": 400, "hot": 100})]
+    comparison = benchmark.compare(make_record("1.1 (2)", {"cold": 500, "hot": 105}), history)
+
+    assert comparison["cold"] == {"baseline_build": "1.0 (1)", "baseline_median": 400, "change": 0.25,
+                                  "regression": True}
+    assert not comparison["hot"]["regression"]
+
+
+def test_compare_small_absolute_change(benchmark):
+    """
+    Test a large relative increase of a fast launch, below the absolute threshold.
+    Ensures that it isn't flagged as regression.
+    """
+    history = [make_record("1.0 (1)", {"hot": 50})]
+    comparison = benchmark.compare(make_record("1.1 (2)", {"hot": 65}), history)
+
+    assert comparison["hot"]["change"] == 0.3
+    assert not comparison["hot"]["regression"]
+
+
+def test_compare_latest_different_build(benchmark):
+    """
+    Test a history with several runs.
+    Ensures that the baseline is the latest run of a different build of the same pair.
+    """
+    history = [
+        make_record("1.0 (1)", {"cold": 400}),
+        make_record("1.1 (2)", {"cold": 450}),
+        make_record("1.1 (2)", {"cold": 300}, device="other-device"),
+        make_record("1.2 (3)", {"cold": 460}),
+    ]
+    comparison = benchmark.compare(make_record("1.2 (3)", {"cold": 470}), history)
+
+    assert comparison["cold"]["baseline_build"] == "1.1 (2)"
+    assert comparison["cold"]["baseline_median"] == 450
+
+
+def test_compare_without_baseline(benchmark):
+    """
+    Test a history with failed runs and runs of the same build only.
+    Ensures that nothing is compared.
+    """
+    history = [
+        {"device": "emulator-5554", "application": "calculator", "build": None, "modes": {},
+         "error": "not installed"},
+        make_record("1.0 (1)", {"cold": 400}),
+    ]
+
+    assert benchmark.compare(make_record("1.0 (1)", {"cold": 900}), history) == {}
+
+
+def test_default_modes_leave_out_warm(benchmark):
+    """
+    Test the default launch modes.
+    Ensures that warm launches, which Android 12+ turns into hot launches, aren't measured by default.
+    """
+    assert benchmark.modes == ["cold", "hot"]
+
+
+def test_benchmark_pair_skips_warm_on_android_12(monkeypatch, adb):
+    """
+    Test a benchmark of every mode on an Android 12+ device.
+    Ensures that warm launches are skipped with a note and the other modes are measured.
+    """
+    monkeypatch.setattr(SystemUtils, "list_adb_devices", staticmethod(lambda: []))
+    benchmark = LaunchBenchmark(modes=LaunchBenchmark.MODES, repetitions=3, settle_time=0)
+    record = benchmark.benchmark_pair("emulator-5554", "calculator", CALCULATOR)
+
+    assert "error" not in record
+    assert record["build"] == "1.2 (7)"
+    assert list(record["modes"]) == ["cold", "warm", "hot"]
+    assert "API 33" in record["modes"]["warm"]["skipped"]
+    assert record["modes"]["cold"]["samples"] == record["modes"]["hot"]["samples"] == [300, 300, 300]
+
+
+def test_benchmark_pair_keeps_modes_after_error(monkeypatch, adb):
+    """
+    Test a benchmark where warm launches are reported as hot launches.
+    Ensures that the error is recorded for the warm mode only and the other modes keep their stats.
+    """
+    adb["sdk"] = "30"
+    monkeypatch.setattr(SystemUtils, "list_adb_devices", staticmethod(lambda: []))
+    benchmark = LaunchBenchmark(modes=LaunchBenchmark.MODES, repetitions=3, settle_time=0)
+    record = benchmark.benchmark_pair("emulator-5554", "calculator", CALCULATOR)
+
+    assert "reported as HOT" in record["modes"]["warm"]["error"]
+    assert record["modes"]["cold"]["stats"]["median"] == record["modes"]["hot"]["stats"]["median"] == 300
+    assert benchmark.compare(record, [make_record("1.1 (6)", {"cold": 300, "warm": 200, "hot": 300})]).keys() == \
+        {"cold", "hot"}
+    assert "warm error: Warm launch" in benchmark.format_matrix([dict(record, comparison={})])
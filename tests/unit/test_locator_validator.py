@@ -0,0 +1,100 @@
+import os
+
+import pytest
+from appium.webdriver.common.appiumby import AppiumBy
+
+from pages.locators.calculator_locators import CalculatorLocators
+from utils.file_manager import FileManager
+from utils.locator_validator import LocatorValidator, LocatorValidatorError
+
+LAUNCH_SCREEN = os.path.join(os.path.dirname(__file__), "fixtures", "calculator_launch_screen.xml")
+
+
+class FakeDriver:
+    """
+    Driver stub returning a fixed page source.
+    """
+    def __init__(self, page_source):
+        self.page_source = page_source
+
+
+@pytest.fixture
+def launch_screen():
+    """
+    Fixture to return the page source of the calculator launch screen.
+    """
+    with open(LAUNCH_SCREEN, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.fixture
+def validator(monkeypatch, tmp_path):
+    """
+    Fixture to reset the preflight results and write the report in a temporary folder.
+    """
+    monkeypatch.setattr(LocatorValidator, "_validated", {})
+    monkeypatch.setattr(FileManager, "SUITE_DIR", str(tmp_path))
+    return LocatorValidator
+
+
+def test_validate_calculator_launch_screen(launch_screen):
+    """
+    Test the calculator locators against the launch screen.
+    Ensures that only the state dependent locators are not found, and they don't count as missing.
+    """
+    result = LocatorValidator.validate(launch_screen, CalculatorLocators.get_all_locators(),
+                                       CalculatorLocators.STATE_DEPENDENT_LOCATORS)
+
+    assert result["missing"] == []
+    assert result["ambiguous"] == []
+    assert result["unsupported"] == []
+    assert sorted(result["not_shown"]) == ["operator C", "result"]
+
+
+def test_validate_statuses(launch_screen):
+    """
+    Test locators that are found once, several times, never, or can't be resolved locally.
+    Ensures that each one gets the right status.
+    """
+    locators = {
+        "formula": (AppiumBy.ID, "formula"),
+        "buttons": (AppiumBy.CLASS_NAME, "android.widget.ImageButton"),
+        "history": (AppiumBy.ACCESSIBILITY_ID, "history"),
+        "uiautomator": (AppiumBy.ANDROID_UIAUTOMATOR, 'new UiSelector().text("1")'),
+        "delete": (AppiumBy.XPATH, "//android.widget.ImageButton[@content-desc='delete']"),
+    }
+
+    result = LocatorValidator.validate(launch_screen, locators)
+
+    assert result == {"missing": ["history"], "ambiguous": ["buttons"], "unsupported": ["uiautomator"],
+                      "not_shown": []}
+
+
+def test_preflight_fails_every_call(validator, launch_screen, tmp_path):
+    """
+    Test the preflight of a locator class with a missing locator.
+    Ensures that every test using the class fails, while the page source is read only once.
+    """
+    class BrokenLocators:
+        @classmethod
+        def get_all_locators(cls):
+            return {"percent": (AppiumBy.ID, "op_pct"), "equal": (AppiumBy.ID, "eq")}
+
+    with pytest.raises(LocatorValidatorError, match="MISSING     percent"):
+        validator.preflight(FakeDriver(launch_screen), [BrokenLocators])
+    # Later tests fail with the same report, without reading the page source again
+    with pytest.raises(LocatorValidatorError, match="MISSING     percent"):
+        validator.preflight(None, [BrokenLocators])
+
+    report = (tmp_path / LocatorValidator.REPORT_FILE).read_text()
+    assert report.count("BrokenLocators") == 1
+
+
+def test_preflight_state_dependent_passes(validator, launch_screen):
+    """
+    Test the preflight of the calculator locators on the launch screen.
+    Ensures that the state dependent locators are reported without failing.
+    """
+    validator.preflight(FakeDriver(launch_screen), [CalculatorLocators])
+    # Validated once per session, the driver isn't used again
+    validator.preflight(None, [CalculatorLocators])
@@ -0,0 +1,141 @@
+import io
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from utils.visual_comparator import VisualComparator, VisualComparatorError
+
+
+@pytest.fixture
+def baseline_dir(tmp_path, monkeypatch):
+    """
+    Fixture to store the baselines in a temporary folder, with empty indexes and cache.
+    """
+    monkeypatch.setattr(VisualComparator, "BASELINE_DIR", f"{tmp_path}/")
+    monkeypatch.setattr(VisualComparator, "_indexes", {})
+    monkeypatch.setattr(VisualComparator, "_cache", type(VisualComparator._cache)())
+    monkeypatch.setattr(VisualComparator, "_cache_bytes", 0)
+    return tmp_path
+
+
+def make_image(width, height, seed=0):
+    """
+    Builds a random RGB image.
+    """
+    return (np.random.RandomState(seed).rand(height, width, 3) * 255).astype(np.uint8)
+
+
+def save_png(path, image):
+    """
+    Saves an image as PNG, creating its folder.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    Image.fromarray(image).save(path)
+
+
+def to_png(image):
+    """
+    Encodes an image as PNG bytes.
+    """
+    buffer = io.BytesIO()
+    Image.fromarray(image).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def test_diff_mask_threshold():
+    """
+    Test pixel differences below and above the threshold.
+    Ensures that only the pixels whose difference exceeds the threshold are reported.
+    """
+    baseline = np.full((10, 10, 3), 100, dtype=np.uint8)
+    image = baseline.copy()
+    image[0, 0] = (110, 100, 100)
+    image[5, 5] = (100, 100, 130)
+
+    difference, compared = VisualComparator.diff_mask(image, baseline, pixel_threshold=16)
+
+    assert np.count_nonzero(difference) == 1
+    assert difference[5, 5]
+    assert compared.all()
+
+
+def test_diff_mask_ignore_regions():
+    """
+    Test differences inside an ignored region.
+    Ensures that the region is neither compared nor reported.
+    """
+    baseline = np.zeros((20, 10, 3), dtype=np.uint8)
+    image = baseline.copy()
+    image[0:4, :] = 255
+    image[15, 5] = 255
+
+    difference, compared = VisualComparator.diff_mask(image, baseline, ignore_regions=[(0, 0, 10, 4)])
+
+    assert np.count_nonzero(compared) == 160
+    assert np.argwhere(difference).tolist() == [[15, 5]]
+
+
+def test_diff_mask_shape_mismatch():
+    """
+    Test images with different resolutions.
+    Ensures that the comparison is refused.
+    """
+    with pytest.raises(VisualComparatorError):
+        VisualComparator.diff_mask(np.zeros((10, 10, 3), np.uint8), np.zeros((20, 10, 3), np.uint8))
+
+
+def test_find_baseline_closest_variant(baseline_dir):
+    """
+    Test a screen with several variants of the same resolution and one of another resolution.
+    Ensures that the variant closest to the screenshot is selected.
+    """
+    light = make_image(60, 100, seed=1)
+    dark = make_image(60, 100, seed=2)
+    save_png(baseline_dir / "screen" / "light.png", light)
+    save_png(baseline_dir / "screen" / "dark.png", dark)
+    save_png(baseline_dir / "screen" / "tablet.png", make_image(100, 60, seed=1))
+
+    screenshot = dark.copy()
+    screenshot[0:5, 0:5] = 0
+
+    assert VisualComparator.find_baseline("screen", screenshot) == f"{baseline_dir}/screen/dark.png"
+    assert set(VisualComparator.get_index("screen")) == {"light.png", "dark.png", "tablet.png"}
+    assert (baseline_dir / "screen" / "index.json").exists()
+
+
+def test_find_baseline_missing_resolution(baseline_dir):
+    """
+    Test a screenshot whose resolution has no baseline.
+    Ensures that no baseline is selected and the comparison fails unless baselines are updated.
+    """
+    save_png(baseline_dir / "screen" / "60x100.png", make_image(60, 100))
+    screenshot = make_image(100, 60)
+
+    assert VisualComparator.find_baseline("screen", screenshot) is None
+    with pytest.raises(VisualComparatorError, match="--update-baselines"):
+        VisualComparator.compare(to_png(screenshot), "screen")
+
+
+def test_load_baseline_eviction(baseline_dir, monkeypatch):
+    """
+    Test loading more baselines than the cache can hold.
+    Ensures that the least recently used baselines are evicted to stay within the byte budget.
+    """
+    # Each 100x100 RGB baseline takes 30000 bytes
+    monkeypatch.setattr(VisualComparator, "CACHE_MAX_BYTES", 70000)
+    paths = []
+    for index in range(3):
+        path = baseline_dir / "screen" / f"{index}.png"
+        save_png(path, make_image(100, 100, seed=index))
+        paths.append(str(path))
+
+    first = VisualComparator.load_baseline(paths[0])
+    VisualComparator.load_baseline(paths[1])
+    assert VisualComparator.load_baseline(paths[0]) is first
+    VisualComparator.load_baseline(paths[2])
+
+    cached_paths = [path for path, _ in VisualComparator._cache]
+    assert cached_paths == [paths[0], paths[2]]
+    assert VisualComparator._cache_bytes == 60000
+    assert not first.flags.writeable
@@ -0,0 +1,234 @@
+import os
+import re
+import time
+import threading
+from collections import deque
+
+from utils.system_utils import SystemUtils, SystemUtilsError
+
+
+class MemoryTrend:
+    """
+    Streaming detector of memory growth.
+
+    Memory use is independent of the run length: the regression slope is computed from
+    running sums, and only the means of the last `max_windows` windows of samples are kept
+    to check if the growth is monotonic.
+    """
+    def __init__(self, window=12, max_windows=360, min_growth_kb=5120, monotonic_ratio=0.8):
+        """
+        Initializes the detector.
+
+        Parameters
+        ----------
+        window : int, optional
+            Number of samples averaged into one window, to smooth the GC noise (default is 12).
+        max_windows : int, optional
+            Maximum number of window means kept in memory (default is 360).
+        min_growth_kb : int, optional
+            Minimum growth between the first and the last window to flag a leak (default is 5120).
+        monotonic_ratio : float, optional
+            Minimum share of window to window steps that must grow to flag a leak (default is 0.8).
+        """
+        self.window = window
+        self.min_growth_kb = min_growth_kb
+        self.monotonic_ratio = monotonic_ratio
+        self.windows = deque(maxlen=max_windows)
+        self.first_window = None
+        self._pending = []
+        self._count = 0
+        self._sum_t = self._sum_v = self._sum_tt = self._sum_tv = 0.0
+
+    def add(self, elapsed, value):
+        """
+        Adds a sample.
+
+        Parameters
+        ----------
+        elapsed : float
+            Seconds since the start of the run.
+        value : float
+            Memory use in KB.
+        """
+        self._count += 1
+        self._sum_t += elapsed
+        self._sum_v += value
+        self._sum_tt += elapsed * elapsed
+        self._sum_tv += elapsed * value
+        self._pending.append(value)
+        if len(self._pending) == self.window:
+            mean = sum(self._pending) / self.window
+            if self.first_window is None:
+                self.first_window = mean
+            self.windows.append(mean)
+            self._pending = []
+
+    def get_result(self):
+        """
+        Returns the current trend.
+
+        Returns
+        -------
+        dict
+            `slope_kb_per_hour` from the linear regression, `growth_kb` between the first
+            and last window, `monotonic_ratio` of growing steps among the kept windows,
+            the number of completed `windows` and `leak_suspected`.
+        """
+        denominator = self._count * self._sum_tt - self._sum_t ** 2
+        slope = (self._count * self._sum_tv - self._sum_t * self._sum_v) / denominator if denominator else 0.0
+        steps = list(zip(self.windows, list(self.windows)[1:]))
+        growing = sum(1 for previous, current in steps if current > previous)
+        ratio = growing / len(steps) if steps else 0.0
+        growth = self.windows[-1] - self.first_window if self.windows else 0.0
+        return {
+            "slope_kb_per_hour": round(slope * 3600, 1),
+            "growth_kb": round(growth, 1),
+            "monotonic_ratio": round(ratio, 2),
+            "windows": self._count // self.window,
+            "leak_suspected": len(steps) >= 3 and ratio >= self.monotonic_ratio and growth >= self.min_growth_kb,
+        }
+
+
+class DeviceResourceSampler:
+    """
+    Background sampler of the resources used by an application on a device.
+
+    At a fixed interval it records the memory (`dumpsys meminfo`), the CPU use (from
+    `/proc/<pid>/stat`) and the frame stats (`dumpsys gfxinfo`) of the application.
+    Each sample is appended to a CSV time series on disk and only the trend state
+    is kept in memory.
+    """
+    CSV_HEADER = "elapsed_s,pss_kb,cpu_percent,frames,janky_frames"
+    CLOCK_TICKS = 100
+
+    def __init__(self, device_name, package, output_path, interval=5.0):
+        """
+        Initializes the sampler.
+
+        Parameters
+        ----------
+        device_name : str
+            Name (adb serial) of the device.
+        package : str
+            Package of the application to sample.
+        output_path : str
+            Path to the CSV time series.
+        interval : float, optional
+            Seconds between samples (default is 5.0).
+        """
+        self.device_name = device_name
+        self.package = package
+        self.output_path = output_path
+        self.interval = interval
+        self.memory_trend = MemoryTrend()
+        self.samples = 0
+        self.failed_samples = 0
+        self.last_error = None
+        self.peak_pss_kb = 0
+        self._stop = threading.Event()
+        self._thread = None
+        self._start_time = None
+        self._last_cpu = None
+
+    def get_memory(self):
+        """
+        Returns the total PSS of the application in KB, or None if it isn't running.
+        """
+        output = SystemUtils.adb_shell(self.device_name, f"dumpsys meminfo {self.package}")
+        match = re.search(r"TOTAL PSS:\s+(\d+)", output) or re.search(r"^\s*TOTAL\s+(\d+)", output, re.MULTILINE)
+        return int(match.group(1)) if match else None
+
+    def get_cpu(self):
+        """
+        Returns the CPU use of the application since the previous sample, in percent of one core.
+        """
+        output = SystemUtils.adb_shell(self.device_name, f"cat /proc/$(pidof -s {self.package})/stat")
+        if ")" not in output:
+            self._last_cpu = None
+            return None
+        pid = output.split()[0]
+        fields = output.rsplit(")", 1)[1].split()
+        ticks = int(fields[11]) + int(fields[12])
+        now = time.monotonic()
+        previous, self._last_cpu = self._last_cpu, (pid, ticks, now)
+        if previous is None or previous[0] != pid or now <= previous[2]:
+            return None
+        return round((ticks - previous[1]) / self.CLOCK_TICKS / (now - previous[2]) * 100, 1)
+
+    def get_frames(self):
+        """
+        Returns the total and janky frames rendered by the application since it started.
+        """
+        output = SystemUtils.adb_shell(self.device_name, f"dumpsys gfxinfo {self.package}")
+        total = re.search(r"Total frames rendered:\s+(\d+)", output)
+        janky = re.search(r"Janky frames:\s+(\d+)", output)
+        return int(total.group(1)) if total else None, int(janky.group(1)) if janky else None
+
+    def take_sample(self):
+        """
+        Takes a sample and appends it to the time series.
+        """
+        elapsed = time.monotonic() - self._start_time
+        pss = self.get_memory()
+        cpu = self.get_cpu()
+        frames, janky = self.get_frames()
+        row = [f"{elapsed:.1f}", pss, cpu, frames, janky]
+        with open(self.output_path, "a") as f:
+            f.write(",".join("" if value is None else str(value) for value in row) + "\n")
+        if pss is not None:
+            self.samples += 1
+            self.peak_pss_kb = max(self.peak_pss_kb, pss)
+            self.memory_trend.add(elapsed, pss)
+
+    def _run(self):
+        """
+        Samples every interval until stopped.
+        """
+        while not self._stop.is_set():
+            start = time.monotonic()
+            try:
+                self.take_sample()
+            except (ValueError, IndexError, OSError, SystemUtilsError) as e:
+                # A sample taken while the app restarts can't be parsed
+                self.failed_samples += 1
+                self.last_error = repr(e)
+            self._stop.wait(max(self.interval - (time.monotonic() - start), 0))
+
+    def start(self):
+        """
+        Starts sampling in a background thread.
+        """
+        os.makedirs(os.path.dirname(self.output_path) or ".", exist_ok=True)
+        with open(self.output_path, "w") as f:
+            f.write(self.CSV_HEADER + "\n")
+        self._start_time = time.monotonic()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="device-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stops sampling and waits for the sample in progress.
+        """
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def get_summary(self):
+        """
+        Returns the summary of the sampled resources.
+
+        Returns
+        -------
+        dict
+            Number of `samples` with the app memory, of `failed_samples` and the `last_error`,
+            `peak_pss_kb`, the time series path and the memory trend.
+        """
+        return {
+            "samples": self.samples,
+            "failed_samples": self.failed_samples,
+            "last_error": self.last_error,
+            "peak_pss_kb": self.peak_pss_kb,
+            "time_series": self.output_path,
+            "memory": self.memory_trend.get_result(),
+        }
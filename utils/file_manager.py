@@ -16,6 +16,7 @@ class FileManager:
     SUITE_DIR = None
     LOG_DIR = None
     EXECUTION_DIR = None
+    SCREENSHOT_DIR = None
     STACK_IGNORE_LIST = ["pytest", "conftest", "fixture", "__init__", "runner"]
 
     @classmethod
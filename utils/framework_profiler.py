@@ -0,0 +1,211 @@
+import os
+import sys
+import time
+import threading
+from collections import Counter
+
+
+class FrameworkProfiler:
+    """
+    Sampling profiler that separates framework Python time from device time.
+
+    A background thread samples the stack of the test thread at a fixed interval.
+    Samples taken while waiting for an Appium command or an adb call are accounted
+    as device time; the remaining samples are Python time spent in the framework,
+    pytest and libraries. The profile is written as folded stacks, the input format
+    of flamegraph tools (`flamegraph.pl`, speedscope, inferno), plus a summary table.
+    """
+    ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    FOLDED_FILE = "profile.folded"
+    SUMMARY_FILE = "profile_summary.txt"
+    TOP_FUNCTIONS = 20
+    APPIUM_WAIT = "[appium wait]"
+    ADB_WAIT = "[adb wait]"
+    FRAMEWORK_PACKAGES = ("drivers", "pages", "utils", "tests")
+    RUNNER_PACKAGES = ("_pytest", "pluggy", "pytest")
+    # The profiling hookwrapper is on every sampled stack, so it isn't framework time
+    PROFILER_LABELS = (os.path.join("tests", "conftest.py") + ":pytest_runtest_protocol",)
+
+    def __init__(self, interval=0.005):
+        """
+        Initializes the profiler.
+
+        Parameters
+        ----------
+        interval : float, optional
+            Time between samples in seconds (default is 0.005).
+        """
+        self.interval = interval
+        self.samples = Counter()
+        self.wall_time = 0.0
+        self._thread_id = None
+        self._sampler = None
+        self._running = threading.Event()
+        self._start_time = None
+
+    def start(self):
+        """
+        Starts sampling the calling thread.
+        """
+        self._thread_id = threading.get_ident()
+        self.samples.clear()
+        self._running.set()
+        self._start_time = time.perf_counter()
+        self._sampler = threading.Thread(target=self._sample_loop, name="framework-profiler", daemon=True)
+        self._sampler.start()
+
+    def stop(self):
+        """
+        Stops sampling.
+        """
+        self._running.clear()
+        self._sampler.join()
+        self.wall_time = time.perf_counter() - self._start_time
+
+    def _sample_loop(self):
+        """
+        Takes a sample of the profiled thread every interval until stopped.
+        """
+        while self._running.is_set():
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is not None:
+                self.samples[self._collapse(frame)] += 1
+            time.sleep(self.interval)
+
+    def _collapse(self, frame):
+        """
+        Converts a frame into a folded stack, root first.
+        Frames below a remote command or an adb call are replaced by a single wait frame.
+        """
+        stack = []
+        while frame is not None:
+            stack.append(frame.f_code)
+            frame = frame.f_back
+        stack.reverse()
+
+        labels = []
+        for code in stack:
+            if code.co_name == "_request" and code.co_filename.endswith(os.path.join("remote", "remote_connection.py")):
+                labels.append(self.APPIUM_WAIT)
+                break
+            if code.co_name in ("communicate", "wait") and os.path.basename(code.co_filename) == "subprocess.py":
+                labels.append(self.ADB_WAIT)
+                break
+            labels.append(self._label(code))
+        return ";".join(labels)
+
+    def _label(self, code):
+        """
+        Returns the flamegraph label of a code object: module and qualified function name.
+        Modules are relative to the project, or to their `sys.path` entry for libraries.
+        """
+        filename = code.co_filename
+        if filename.startswith(self.ROOT_DIR) and "site-packages" not in filename:
+            module = os.path.relpath(filename, self.ROOT_DIR)
+        else:
+            paths = [path for path in sys.path if path and filename.startswith(os.path.join(path, ""))]
+            module = os.path.relpath(filename, max(paths, key=len)) if paths else os.path.basename(filename)
+        return f"{module}:{getattr(code, 'co_qualname', code.co_name)}"
+
+    def is_framework_label(self, label):
+        """
+        Checks if a label belongs to the framework code (drivers, pages, utils and tests).
+        The profiler and the hookwrapper running it are excluded.
+        """
+        module = label.split(":")[0]
+        return module.split(os.sep)[0] in self.FRAMEWORK_PACKAGES and \
+            module != os.path.relpath(__file__, self.ROOT_DIR) and label not in self.PROFILER_LABELS
+
+    def is_runner_label(self, label):
+        """
+        Checks if a label belongs to the test runner (pytest and pluggy).
+        """
+        return label.split(":")[0].split(os.sep)[0] in self.RUNNER_PACKAGES
+
+    def get_summary(self):
+        """
+        Splits the sampled time between Python and device time.
+
+        Returns
+        -------
+        dict
+            `wall_time`, `appium_time`, `adb_time`, `python_time` and `framework_time`
+            in seconds, plus `functions`: framework functions mapped to their inclusive
+            Python time.
+
+        A sample is framework time when its innermost framework frame is the leaf frame, or
+        only calls into stdlib and library code; samples in pytest itself, e.g. running a
+        fixture below a framework frame, are not.
+        """
+        total = sum(self.samples.values())
+        # Scale samples to the measured wall time, as sleep() overshoots the interval
+        sample_time = self.wall_time / total if total else 0.0
+        appium = adb = framework = 0
+        functions = Counter()
+        for stack, count in self.samples.items():
+            labels = stack.split(";")
+            if labels[-1] == self.APPIUM_WAIT:
+                appium += count
+                continue
+            if labels[-1] == self.ADB_WAIT:
+                adb += count
+                continue
+            framework_indexes = [index for index, label in enumerate(labels) if self.is_framework_label(label)]
+            if not framework_indexes:
+                continue
+            if not any(self.is_runner_label(label) for label in labels[framework_indexes[-1] + 1:]):
+                framework += count
+            for label in {labels[index] for index in framework_indexes}:
+                functions[label] += count
+        return {
+            "wall_time": self.wall_time,
+            "appium_time": appium * sample_time,
+            "adb_time": adb * sample_time,
+            "python_time": (total - appium - adb) * sample_time,
+            "framework_time": framework * sample_time,
+            "functions": {label: count * sample_time for label, count in functions.most_common(self.TOP_FUNCTIONS)},
+        }
+
+    def format_summary(self, test_name):
+        """
+        Builds the summary table of the profile.
+
+        Parameters
+        ----------
+        test_name : str
+            Name of the profiled test.
+
+        Returns
+        -------
+        str
+            The summary table.
+        """
+        summary = self.get_summary()
+        wall_time = summary["wall_time"] or 1.0
+        lines = [f"Framework profile for {test_name} ({sum(self.samples.values())} samples)", ""]
+        for key, title in (("wall_time", "Wall time"), ("appium_time", "Appium command wait"),
+                           ("adb_time", "adb wait"), ("python_time", "Python time"),
+                           ("framework_time", "  of which framework code")):
+            lines.append(f"{title:<28}{summary[key]:>10.3f} s {summary[key] / wall_time:>8.1%}")
+        lines += ["", f"{'Framework function (inclusive Python time)':<80}{'seconds':>10}"]
+        for label, seconds in summary["functions"].items():
+            lines.append(f"{label:<80}{seconds:>10.3f}")
+        return "\n".join(lines)
+
+    def save(self, output_dir, test_name):
+        """
+        Writes the folded stacks and the summary table.
+
+        Parameters
+        ----------
+        output_dir : str
+            Folder of the test execution.
+        test_name : str
+            Name of the profiled test.
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        with open(os.path.join(output_dir, self.FOLDED_FILE), "w") as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+        with open(os.path.join(output_dir, self.SUMMARY_FILE), "w") as f:
+            f.write(self.format_summary(test_name) + "\n")
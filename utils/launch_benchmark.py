@@ -0,0 +1,445 @@
+"""
+launch_benchmark
+Cold, warm and hot launch time benchmark of the configured applications on the connected devices.
+
+Usage:
+    python -m utils.launch_benchmark --repetitions 10 --applications calculator clock --modes cold hot
+"""
+import os
+import re
+import json
+import time
+import datetime
+import argparse
+import statistics
+
+from utils.file_manager import FileManager
+from utils.system_utils import SystemUtils, SystemUtilsError
+
+
+class LaunchBenchmarkError(Exception):
+    """
+    Custom exception for LaunchBenchmark errors.
+    Used to handle specific issues related to the launch measurements.
+    """
+
+
+class LaunchBenchmark:
+    """
+    Measures the launch time of every (device, application) pair with `am start -W`.
+
+    - Cold launches force-stop the application first.
+    - Warm launches finish the activity with BACK, so it is created again in the running process.
+      Android 12+ keeps root activities on BACK, so warm launches are skipped there and aren't
+      measured by default.
+    - Hot launches send the application to the home screen, so its activity is brought back to the front.
+
+    The `LaunchState` reported by Android 10+ is checked against the mode. A mode that can't be
+    measured records its error without discarding the other modes. Results are appended to a
+    history file, and each pair is compared against the latest results of a different build of
+    the application to flag launch time regressions.
+    """
+    DEVICE_CONFIG_PATH = "config/device_config.json"
+    HISTORY_FILE = os.path.join(FileManager.BASE_REPORT_DIR, "launch_benchmark_history.jsonl")
+    MODES = ("cold", "warm", "hot")
+    DEFAULT_MODES = ("cold", "hot")
+    # Android 12 (API 31) moves root activities to the background on BACK instead of finishing them
+    WARM_MAX_SDK = 30
+
+    def __init__(self, applications=None, devices=None, modes=DEFAULT_MODES, repetitions=10, settle_time=1.0,
+                 threshold=0.1, min_delta_ms=20):
+        """
+        Initializes the benchmark.
+
+        Parameters
+        ----------
+        applications : list of str, optional
+            Names of the applications in `appium_config.yaml` (default is every configured application).
+        devices : list of str, optional
+            Names of the devices in `device_config.json` (default is every connected configured device).
+        modes : tuple of str, optional
+            Launch modes to measure, among "cold", "warm" and "hot" (default is "cold" and "hot").
+        repetitions : int, optional
+            Number of launches per mode (default is 10).
+        settle_time : float, optional
+            Seconds to wait between launches (default is 1.0).
+        threshold : float, optional
+            Relative increase of the median launch time flagged as regression (default is 0.1).
+        min_delta_ms : int, optional
+            Minimum absolute increase of the median, in milliseconds, flagged as regression (default is 20).
+        """
+        self.applications = {name: app for name, app in self.get_launchable_applications().items()
+                             if applications is None or name in applications}
+        self.devices = [device for device in self.get_connected_devices() if devices is None or device in devices]
+        self.modes = [mode for mode in self.MODES if mode in modes]
+        self.repetitions = repetitions
+        self.settle_time = settle_time
+        self.threshold = threshold
+        self.min_delta_ms = min_delta_ms
+
+    @staticmethod
+    def get_launchable_applications():
+        """
+        Returns the applications of `appium_config.yaml` that can be launched.
+
+        Returns
+        -------
+        dict
+            Application name mapped to its configuration. Entries without package or activity
+            (e.g. messages) are left out.
+        """
+        return {name: app for name, app in SystemUtils.get_appium_config("applications").items()
+                if app and app.get("appPackage") and app.get("appActivity")}
+
+    @classmethod
+    def get_connected_devices(cls):
+        """
+        Returns the devices of `device_config.json` connected via adb.
+
+        Returns
+        -------
+        list of str
+            Names (adb serials) of the devices, in configuration order.
+        """
+        connected_devices = SystemUtils.list_adb_devices()
+        return [device["deviceName"] for device in SystemUtils.load_json(cls.DEVICE_CONFIG_PATH)["devices"]
+                if device["deviceName"] in connected_devices]
+
+    @staticmethod
+    def get_app_build(device_name, package):
+        """
+        Returns the installed build of an application.
+
+        Returns
+        -------
+        str or None
+            The build as "<versionName> (<versionCode>)", or None if the package isn't installed.
+        """
+        output = SystemUtils.adb_shell(device_name, f"dumpsys package {package}")
+        version_name = re.search(r"versionName=(\S+)", output)
+        version_code = re.search(r"versionCode=(\d+)", output)
+        if not version_name and not version_code:
+            return None
+        return f"{version_name.group(1) if version_name else '?'} ({version_code.group(1) if version_code else '?'})"
+
+    @staticmethod
+    def get_sdk_version(device_name):
+        """
+        Returns the Android API level of a device.
+
+        Returns
+        -------
+        int or None
+            The API level, or None if it can't be read.
+        """
+        output = SystemUtils.adb_shell(device_name, "getprop ro.build.version.sdk")
+        return int(output) if output.isdigit() else None
+
+    def measure_launch(self, device_name, package, activity, mode):
+        """
+        Launches an activity and returns its launch time.
+
+        Parameters
+        ----------
+        device_name : str
+            Name (adb serial) of the device.
+        package : str
+            Package of the application.
+        activity : str
+            Activity to launch, absolute or relative to the package.
+        mode : str
+            "cold" to force-stop the application first, "warm" to finish its activity with BACK
+            or "hot" to send it to the home screen.
+
+        Returns
+        -------
+        int
+            The `TotalTime` reported by `am start -W`, in milliseconds.
+
+        Raises
+        ------
+        LaunchBenchmarkError
+            If the launch time isn't reported, or the reported launch state doesn't match the mode.
+        """
+        if mode == "cold":
+            SystemUtils.adb_shell(device_name, f"am force-stop {package}")
+        elif mode == "warm":
+            SystemUtils.adb_shell(device_name, "input keyevent KEYCODE_BACK")
+        else:
+            SystemUtils.adb_shell(device_name, "input keyevent KEYCODE_HOME")
+        time.sleep(self.settle_time)
+        output = SystemUtils.adb_shell(device_name, f"am start -W -n {package}/{activity}")
+        total_time = re.search(r"TotalTime:\s+(\d+)", output)
+        if not total_time:
+            raise LaunchBenchmarkError(f"Launch time not reported for {package}/{activity} on {device_name}: {output}")
+        # Android 12+ only moves a root activity to the background on BACK, which makes a hot launch
+        launch_state = re.search(r"LaunchState:\s+(\w+)", output)
+        if launch_state and launch_state.group(1).lower() != mode:
+            raise LaunchBenchmarkError(f"{mode.capitalize()} launch of {package}/{activity} on {device_name} "
+                                       f"was reported as {launch_state.group(1)}, exclude it with --modes")
+        return int(total_time.group(1))
+
+    @staticmethod
+    def compute_stats(samples):
+        """
+        Computes the statistics of a list of launch times.
+
+        Parameters
+        ----------
+        samples : list of int
+            Launch times in milliseconds.
+
+        Returns
+        -------
+        dict
+            `min`, `median`, `mean`, `p90`, `max` and `stdev` in milliseconds.
+        """
+        ordered = sorted(samples)
+        return {
+            "min": ordered[0],
+            "median": statistics.median(ordered),
+            "mean": round(statistics.fmean(ordered), 1),
+            "p90": ordered[min(int(round(0.9 * (len(ordered) - 1))), len(ordered) - 1)],
+            "max": ordered[-1],
+            "stdev": round(statistics.stdev(ordered), 1) if len(ordered) > 1 else 0.0,
+        }
+
+    def benchmark_pair(self, device_name, app_name, application):
+        """
+        Benchmarks the launches of an application on a device.
+
+        Returns
+        -------
+        dict
+            The benchmark record: device, application, build and per mode either its samples
+            and stats, the `error` that stopped it or the reason it was `skipped`. The record
+            has an `error` itself if the application isn't installed.
+        """
+        package, activity = application["appPackage"], application["appActivity"]
+        record = {
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "device": device_name,
+            "application": app_name,
+            "build": self.get_app_build(device_name, package),
+            "modes": {},
+        }
+        if record["build"] is None:
+            record["error"] = f"{package} is not installed"
+            return record
+
+        modes = list(self.modes)
+        if "warm" in modes:
+            sdk_version = self.get_sdk_version(device_name)
+            if sdk_version is not None and sdk_version > self.WARM_MAX_SDK:
+                modes.remove("warm")
+                record["modes"]["warm"] = {"skipped": f"API {sdk_version} relaunches after BACK are hot launches"}
+
+        samples = {mode: [] for mode in modes}
+        for _ in range(self.repetitions):
+            for mode in list(modes):
+                try:
+                    samples[mode].append(self.measure_launch(device_name, package, activity, mode))
+                except (LaunchBenchmarkError, SystemUtilsError) as e:
+                    modes.remove(mode)
+                    record["modes"][mode] = {"error": str(e)}
+        SystemUtils.adb_shell(device_name, f"am force-stop {package}")
+
+        for mode in modes:
+            record["modes"][mode] = {"samples": samples[mode], "stats": self.compute_stats(samples[mode])}
+        record["modes"] = {mode: record["modes"][mode] for mode in self.MODES if mode in record["modes"]}
+        return record
+
+    def load_history(self):
+        """
+        Loads the records of the previous benchmarks.
+
+        Returns
+        -------
+        list of dict
+            The records, oldest first.
+        """
+        if not os.path.exists(self.HISTORY_FILE):
+            return []
+        with open(self.HISTORY_FILE, "r") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def compare(self, record, history):
+        """
+        Compares a record against the latest record of a different build of the same pair.
+
+        Parameters
+        ----------
+        record : dict
+            The new benchmark record.
+        history : list of dict
+            The previous records, oldest first.
+
+        Returns
+        -------
+        dict
+            Per mode: the `baseline_build`, `baseline_median`, relative `change` and `regression` flag.
+        """
+        baseline = next((previous for previous in reversed(history)
+                         if previous["device"] == record["device"] and previous["application"] == record["application"]
+                         and previous.get("build") not in (None, record["build"]) and previous.get("modes")), None)
+        comparison = {}
+        if baseline is None:
+            return comparison
+        for mode, result in record["modes"].items():
+            if "stats" not in result or "stats" not in baseline["modes"].get(mode, {}):
+                continue
+            baseline_median = baseline["modes"][mode]["stats"]["median"]
+            median = result["stats"]["median"]
+            delta = median - baseline_median
+            comparison[mode] = {
+                "baseline_build": baseline["build"],
+                "baseline_median": baseline_median,
+                "change": round(delta / baseline_median, 3) if baseline_median else 0.0,
+                "regression": delta >= self.min_delta_ms and delta > self.threshold * baseline_median,
+            }
+        return comparison
+
+    def run(self):
+        """
+        Benchmarks every (device, application) pair and appends each result to the history
+        as soon as it is measured.
+
+        Returns
+        -------
+        list of dict
+            The benchmark records, each with its comparison against the previous build.
+        """
+        if not self.devices:
+            raise LaunchBenchmarkError("No configured device connected via adb")
+        history = self.load_history()
+        os.makedirs(os.path.dirname(self.HISTORY_FILE), exist_ok=True)
+        records = []
+        for device_name in self.devices:
+            for app_name, application in self.applications.items():
+                print(f"Benchmarking {app_name} on {device_name}")
+                record = self.benchmark_pair(device_name, app_name, application)
+                if "error" in record:
+                    print(f"Skipping {app_name} on {device_name}: {record['error']}")
+                for mode, result in record["modes"].items():
+                    if "error" in result or "skipped" in result:
+                        print(f"No {mode} launches of {app_name} on {device_name}: "
+                              f"{result.get('error', result.get('skipped'))}")
+                record["comparison"] = self.compare(record, history)
+                records.append(record)
+                with open(self.HISTORY_FILE, "a") as f:
+                    f.write(json.dumps(record) + "\n")
+        return records
+
+    def format_matrix(self, records):
+        """
+        Builds the device x application matrix of median launch times per mode.
+
+        Parameters
+        ----------
+        records : list of dict
+            The benchmark records.
+
+        Returns
+        -------
+        str
+            The matrix, with the change against the previous build and regressions flagged,
+            followed by the modes that failed or were skipped.
+        """
+        cells = {}
+        notes = []
+        for record in records:
+            if "error" in record:
+                cells[(record["device"], record["application"])] = record["error"]
+                continue
+            parts = []
+            for mode, result in record["modes"].items():
+                if "stats" not in result:
+                    status = "error" if "error" in result else "skipped"
+                    parts.append(f"{mode} {status}")
+                    notes.append(f"{record['device']} {record['application']} {mode} {status}: {result[status]}")
+                    continue
+                text = f"{mode} {result['stats']['median']:.0f}ms"
+                comparison = record["comparison"].get(mode)
+                if comparison:
+                    text += f" ({comparison['change']:+.0%}{' REGRESSION' if comparison['regression'] else ''})"
+                parts.append(text)
+            cells[(record["device"], record["application"])] = ", ".join(parts)
+
+        applications = list(dict.fromkeys(record["application"] for record in records))
+        devices = list(dict.fromkeys(record["device"] for record in records))
+        widths = [max([len("device")] + [len(device) for device in devices])]
+        widths += [max([len(app)] + [len(cells.get((device, app), "")) for device in devices]) for app in applications]
+        rows = [["device"] + applications] + [[device] + [cells.get((device, app), "") for app in applications]
+                                              for device in devices]
+        lines = [" | ".join(value.ljust(width) for value, width in zip(row, widths)).rstrip() for row in rows]
+        lines.insert(1, "-+-".join("-" * width for width in widths))
+        if notes:
+            lines += [""] + notes
+        return "\n".join(lines)
+
+    def save(self, records):
+        """
+        Saves the records and the matrix of this benchmark in its own report folder.
+
+        Parameters
+        ----------
+        records : list of dict
+            The benchmark records.
+
+        Returns
+        -------
+        str
+            Path to the report folder.
+        """
+        timestamp = datetime.datetime.now().strftime("%Y-%m-%d-%H-%M-%S")
+        report_dir = os.path.join(FileManager.BASE_REPORT_DIR, f"launch-benchmark-{timestamp}")
+        os.makedirs(report_dir, exist_ok=True)
+        with open(os.path.join(report_dir, "launch_benchmark.json"), "w") as f:
+            json.dump(records, f, indent=4)
+        with open(os.path.join(report_dir, "launch_matrix.txt"), "w") as f:
+            f.write(self.format_matrix(records) + "\n")
+        return report_dir
+
+
+def main(argv=None):
+    """
+    Command line entry point of the launch benchmark.
+
+    Returns
+    -------
+    int
+        1 if a regression was detected, 0 otherwise.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the cold, warm and hot launch times of the configured apps")
+    parser.add_argument("--applications", nargs="+", help="Applications from appium_config.yaml (default is all)")
+    parser.add_argument("--devices", nargs="+", help="Devices from device_config.json (default is all connected)")
+    parser.add_argument("--modes", nargs="+", choices=LaunchBenchmark.MODES, default=list(LaunchBenchmark.DEFAULT_MODES),
+                        help="Launch modes to measure (default is cold and hot, warm is skipped on Android 12+)")
+    parser.add_argument("--repetitions", type=int, default=10, help="Launches per mode (default is 10)")
+    parser.add_argument("--settle-time", type=float, default=1.0, help="Seconds between launches (default is 1)")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="Relative median increase flagged as regression (default is 0.1)")
+    parser.add_argument("--min-delta-ms", type=int, default=20,
+                        help="Absolute median increase flagged as regression (default is 20)")
+    args = parser.parse_args(argv)
+
+    unknown_applications = set(args.applications or []) - set(LaunchBenchmark.get_launchable_applications())
+    if unknown_applications:
+        parser.error(f"unknown or not launchable applications: {', '.join(sorted(unknown_applications))}")
+    unknown_devices = set(args.devices or []) - set(LaunchBenchmark.get_connected_devices())
+    if unknown_devices:
+        parser.error(f"devices not configured or not connected: {', '.join(sorted(unknown_devices))}")
+
+    benchmark = LaunchBenchmark(applications=args.applications, devices=args.devices, modes=args.modes,
+                                repetitions=args.repetitions, settle_time=args.settle_time,
+                                threshold=args.threshold, min_delta_ms=args.min_delta_ms)
+    records = benchmark.run()
+    report_dir = benchmark.save(records)
+    print(benchmark.format_matrix(records))
+    print(f"Report saved to {report_dir}")
+    regression = any(comparison["regression"] for record in records for comparison in record["comparison"].values())
+    return 1 if regression else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
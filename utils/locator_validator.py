@@ -0,0 +1,165 @@
+import os
+import xml.etree.ElementTree as ElementTree
+
+from appium.webdriver.common.appiumby import AppiumBy
+
+from utils.file_manager import FileManager
+
+
+class LocatorValidatorError(Exception):
+    """
+    Custom exception for LocatorValidator errors.
+    Used to report locators that can't be resolved in the application.
+    """
+
+
+class LocatorValidator:
+    """
+    Preflight validation of locator classes.
+
+    Every locator a locator class can produce (see `get_all_locators`) is resolved locally
+    against a single `page_source` snapshot, so a broken locator is reported at session
+    start instead of costing the full implicit wait on every call. Locators listed in the
+    `STATE_DEPENDENT_LOCATORS` of a locator class only exist in some screen states, so they
+    are reported but don't fail the validation when they are missing.
+    """
+    REPORT_FILE = "locator_preflight.txt"
+    ATTRIBUTE_BY_STRATEGY = {
+        AppiumBy.ID: "resource-id",
+        AppiumBy.ACCESSIBILITY_ID: "content-desc",
+    }
+
+    _validated = {}
+
+    @classmethod
+    def count_matches(cls, root, locator_type, locator_value):
+        """
+        Counts the elements of a page source tree matching a locator.
+
+        Parameters
+        ----------
+        root : xml.etree.ElementTree.Element
+            Root of the parsed page source.
+        locator_type : AppiumBy
+            The type of locator.
+        locator_value : str
+            The locator value.
+
+        Returns
+        -------
+        int or None
+            Number of matching elements, or None if the locator can't be resolved locally.
+        """
+        if locator_type in cls.ATTRIBUTE_BY_STRATEGY:
+            attribute = cls.ATTRIBUTE_BY_STRATEGY[locator_type]
+            if locator_type == AppiumBy.ID and ":id/" not in locator_value:
+                # UiAutomator2 prefixes short ids with the application package
+                return sum(1 for element in root.iter()
+                           if element.get(attribute, "").endswith(f":id/{locator_value}"))
+            return sum(1 for element in root.iter() if element.get(attribute) == locator_value)
+        if locator_type == AppiumBy.CLASS_NAME:
+            return sum(1 for element in root.iter() if element.tag == locator_value)
+        if locator_type == AppiumBy.XPATH and locator_value.startswith("//"):
+            try:
+                return len(root.findall(f".{locator_value}"))
+            except SyntaxError:
+                # ElementTree only supports a subset of XPath
+                return None
+        return None
+
+    @classmethod
+    def validate(cls, page_source, locators, state_dependent=()):
+        """
+        Resolves a set of locators against a page source snapshot.
+
+        Parameters
+        ----------
+        page_source : str
+            The page source returned by the driver.
+        locators : dict
+            Locator name mapped to its locator tuple.
+        state_dependent : collection of str, optional
+            Names of the locators that only exist in some screen states (default is none).
+
+        Returns
+        -------
+        dict
+            Names of the `missing`, `ambiguous` (more than one match) and `unsupported` locators,
+            and of the `not_shown` state dependent locators missing from this screen.
+        """
+        root = ElementTree.fromstring(page_source.encode("utf-8"))
+        result = {"missing": [], "ambiguous": [], "unsupported": [], "not_shown": []}
+        for name, (locator_type, locator_value) in locators.items():
+            matches = cls.count_matches(root, locator_type, locator_value)
+            if matches is None:
+                result["unsupported"].append(name)
+            elif matches == 0:
+                result["not_shown" if name in state_dependent else "missing"].append(name)
+            elif matches > 1:
+                result["ambiguous"].append(name)
+        return result
+
+    @staticmethod
+    def format_report(locator_class, locators, result):
+        """
+        Builds a readable report of a validation result.
+
+        Parameters
+        ----------
+        locator_class : type
+            The validated locator class.
+        locators : dict
+            Locator name mapped to its locator tuple.
+        result : dict
+            The result returned by `validate`.
+
+        Returns
+        -------
+        str
+            The report.
+        """
+        lines = [f"Locator preflight for {locator_class.__name__}: {len(locators)} locators checked"]
+        for status in ("missing", "ambiguous", "unsupported", "not_shown"):
+            for name in result[status]:
+                locator_type, locator_value = locators[name]
+                lines.append(f"  {status.upper():<11} {name}: ({locator_type}, {locator_value})")
+        return "\n".join(lines)
+
+    @classmethod
+    def preflight(cls, driver, locator_classes):
+        """
+        Validates locator classes against the current screen, once per session.
+
+        The report is written to the suite folder. The result of each class is kept, so every
+        later call with a failed class raises again: the tests using it fail, the others run.
+
+        Parameters
+        ----------
+        driver : WebDriver
+            The active driver instance.
+        locator_classes : list
+            Locator classes providing a `get_all_locators` classmethod.
+
+        Raises
+        ------
+        LocatorValidatorError
+            If any locator that isn't state dependent is missing, or any locator is ambiguous.
+        """
+        pending = [locator_class for locator_class in locator_classes if locator_class not in cls._validated]
+        if pending:
+            page_source = driver.page_source
+            reports = []
+            for locator_class in pending:
+                locators = locator_class.get_all_locators()
+                result = cls.validate(page_source, locators, getattr(locator_class, "STATE_DEPENDENT_LOCATORS", ()))
+                report = cls.format_report(locator_class, locators, result)
+                reports.append(report)
+                cls._validated[locator_class] = report if result["missing"] or result["ambiguous"] else None
+
+            if FileManager.SUITE_DIR:
+                with open(os.path.join(FileManager.SUITE_DIR, cls.REPORT_FILE), "a") as f:
+                    f.write("\n".join(reports) + "\n")
+
+        failures = [cls._validated[locator_class] for locator_class in locator_classes if cls._validated[locator_class]]
+        if failures:
+            raise LocatorValidatorError("\n".join(failures))
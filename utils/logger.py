@@ -9,6 +9,7 @@ class Logger:
     Creates a separate directoryu for each test execution.
     """
     _loggers = {}
+    _logger = None
 
     @classmethod
     def setup_logger(cls, test_name):
@@ -0,0 +1,159 @@
+import os
+import json
+import time
+
+from utils.device_sampler import DeviceResourceSampler
+from utils.file_manager import FileManager
+from utils.logger import Logger
+
+
+class SoakRunnerError(Exception):
+    """
+    Custom exception for SoakRunner errors.
+    Used to handle specific issues related to endurance runs.
+    """
+
+
+class SoakRunner:
+    """
+    Runs a page-object flow in a loop for a duration or a number of iterations,
+    while a `DeviceResourceSampler` records the application resources.
+
+    Only aggregated iteration stats and the first failures are kept in memory,
+    so the runner can loop for hours.
+    """
+    MAX_FAILURES = 20
+    MAX_CONSECUTIVE_FAILURES = 5
+    TIME_SERIES_FILE = "resources.csv"
+    SUMMARY_FILE = "soak_summary.json"
+
+    def __init__(self, driver, device_name, package, duration=None, iterations=None, sample_interval=5.0):
+        """
+        Initializes the soak runner.
+
+        Parameters
+        ----------
+        driver : WebDriver
+            The active driver instance.
+        device_name : str
+            Name (adb serial) of the device the driver runs on.
+        package : str
+            Package of the application under test.
+        duration : float, optional
+            Duration of the run in seconds.
+        iterations : int, optional
+            Number of iterations of the flow. If both limits are set, the first one reached stops the run.
+        sample_interval : float, optional
+            Seconds between resource samples (default is 5.0).
+        """
+        if duration is None and iterations is None:
+            raise SoakRunnerError("A duration or a number of iterations is required")
+        self.driver = driver
+        self.device_name = device_name
+        self.package = package
+        self.duration = duration
+        self.iterations = iterations
+        self.sample_interval = sample_interval
+        self.logger = Logger.get_logger()
+
+    def run(self, flow):
+        """
+        Runs the flow in a loop and samples the application resources meanwhile.
+
+        Parameters
+        ----------
+        flow : callable
+            Function receiving the iteration number, e.g. a sequence of `CalculatorPage` actions.
+
+        Returns
+        -------
+        dict
+            Summary of the run, also saved to `soak_summary.json` in the execution folder.
+
+        Raises
+        ------
+        SoakRunnerError
+            If the flow fails too many times in a row, as the app is likely no longer usable.
+        """
+        sampler = DeviceResourceSampler(
+            device_name=self.device_name,
+            package=self.package,
+            output_path=os.path.join(FileManager.EXECUTION_DIR, self.TIME_SERIES_FILE),
+            interval=self.sample_interval
+        )
+        stats = {"iterations": 0, "failures": 0, "total_time": 0.0, "max_time": 0.0}
+        failures = []
+        consecutive_failures = 0
+
+        self.logger.info(f"Starting soak run: duration={self.duration}s, iterations={self.iterations}")
+        start = time.monotonic()
+        sampler.start()
+        try:
+            while not self._is_done(stats["iterations"], start):
+                iteration_start = time.monotonic()
+                try:
+                    flow(stats["iterations"])
+                    consecutive_failures = 0
+                except Exception as e:
+                    stats["failures"] += 1
+                    consecutive_failures += 1
+                    if len(failures) < self.MAX_FAILURES:
+                        failures.append({"iteration": stats["iterations"], "error": repr(e)})
+                    self.logger.warning(f"Soak iteration {stats['iterations']} failed: {e!r}")
+                    if consecutive_failures >= self.MAX_CONSECUTIVE_FAILURES:
+                        raise SoakRunnerError(f"Soak flow failed {consecutive_failures} times in a row") from e
+                finally:
+                    elapsed = time.monotonic() - iteration_start
+                    stats["iterations"] += 1
+                    stats["total_time"] += elapsed
+                    stats["max_time"] = max(stats["max_time"], elapsed)
+        finally:
+            sampler.stop()
+            summary = self._build_summary(stats, failures, time.monotonic() - start, sampler)
+            self.save_summary(summary)
+        return summary
+
+    def _is_done(self, iterations, start):
+        """
+        Checks if the duration or the number of iterations is reached.
+        """
+        if self.iterations is not None and iterations >= self.iterations:
+            return True
+        return self.duration is not None and time.monotonic() - start >= self.duration
+
+    def _build_summary(self, stats, failures, elapsed, sampler):
+        """
+        Builds the summary of the run.
+        """
+        iterations = stats["iterations"]
+        return {
+            "duration_s": round(elapsed, 1),
+            "iterations": iterations,
+            "failures": stats["failures"],
+            "mean_iteration_s": round(stats["total_time"] / iterations, 3) if iterations else 0.0,
+            "max_iteration_s": round(stats["max_time"], 3),
+            "first_failures": failures,
+            "resources": sampler.get_summary(),
+        }
+
+    def save_summary(self, summary):
+        """
+        Saves the summary of the run to the execution folder and logs its trend.
+
+        Parameters
+        ----------
+        summary : dict
+            The summary of the run.
+        """
+        with open(os.path.join(FileManager.EXECUTION_DIR, self.SUMMARY_FILE), "w") as f:
+            json.dump(summary, f, indent=4)
+        resources = summary["resources"]
+        memory = resources["memory"]
+        self.logger.info(f"Soak run finished: {summary['iterations']} iterations, {summary['failures']} failures, "
+                         f"{resources['samples']} memory samples ({resources['failed_samples']} failed), "
+                         f"memory slope {memory['slope_kb_per_hour']} KB/h, growth {memory['growth_kb']} KB")
+        if resources["failed_samples"]:
+            self.logger.warning(f"{resources['failed_samples']} resource samples failed, last error: "
+                                f"{resources['last_error']}")
+        if memory["leak_suspected"]:
+            self.logger.warning("Monotonic memory growth detected, the application may be leaking memory")
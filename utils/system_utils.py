@@ -23,6 +23,10 @@ class SystemUtils:
     A wrapper class to execute system commands across different platforms (Windows, Mac, Linux).
     Also provides utilities for ADB commands.
     """
+    APPIUM_CONFIG_PATH = "config/appium_config.yaml"
+
+    _appium_config = None
+
     @staticmethod
     def get_os():
         """
@@ -71,6 +75,25 @@ class SystemUtils:
         devices = [line.split()[0] for line in output.splitlines() if "device" in line and "List" not in line]
         return devices if devices else []
 
+    @staticmethod
+    def adb_shell(device_name, command):
+        """
+        Runs a shell command on a device using adb.
+
+        Parameters
+        ----------
+        device_name : str
+            Name (adb serial) of the device.
+        command : str
+            The shell command.
+
+        Returns
+        -------
+        str
+            The command output.
+        """
+        return SystemUtils.send_cmd(["adb", "-s", device_name, "shell", command])
+
     @staticmethod
     def is_adb_available():
         """
@@ -128,6 +151,27 @@ class SystemUtils:
         with open(path, "r") as f:
             return yaml.safe_load(f)
 
+    @classmethod
+    def get_appium_config(cls, section=None):
+        """
+        Returns the content of `appium_config.yaml`, loaded once per run.
+
+        Parameters
+        ----------
+        section : str, optional
+            Name of a top level section, e.g. "server_pool" (default is the whole file).
+
+        Returns
+        -------
+        dict
+            The configuration, or the section, empty if the section is missing.
+        """
+        if cls._appium_config is None:
+            cls._appium_config = cls.load_yaml(cls.APPIUM_CONFIG_PATH)
+        if section is None:
+            return cls._appium_config
+        return cls._appium_config.get(section) or {}
+
     @staticmethod
     def load_json(path):
         """
@@ -0,0 +1,267 @@
+import re
+import json
+import time
+import bisect
+import threading
+from collections import deque
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+
+class TelemetryError(Exception):
+    """
+    Custom exception for Telemetry errors.
+    Used to handle specific issues related to the telemetry endpoint.
+    """
+
+
+class Telemetry:
+    """
+    Live run-progress telemetry served over a local HTTP endpoint.
+
+    Test threads only append event tuples to a bounded deque, which doesn't need a lock.
+    A background thread drains the events into fixed-size aggregates: test counters,
+    in-flight tests per device and a latency histogram per Appium command.
+
+    Endpoints:
+        - `/metrics`: JSON snapshot of the aggregates.
+        - `/stream`: the same snapshot as server-sent events, pushed every second.
+    """
+    MAX_EVENTS = 100000
+    MAX_COMMANDS = 100
+    AGGREGATION_INTERVAL = 0.2
+    STREAM_INTERVAL = 1.0
+    # Upper bounds in milliseconds of the latency histogram buckets, the last one catches the rest
+    LATENCY_BUCKETS = (1, 2, 3, 5, 7, 10, 15, 20, 30, 50, 70, 100, 150, 200, 300, 500, 700, 1000, 1500, 2000,
+                       3000, 5000, 10000, 30000, 60000, float("inf"))
+    SESSION_PATH = re.compile(r"^.*?/session/[^/]+/?")
+    ELEMENT_ID = re.compile(r"/element/[^/]+")
+
+    enabled = False
+
+    _events = deque(maxlen=MAX_EVENTS)
+    _lock = threading.Lock()
+    _stop = threading.Event()
+    _server = None
+    _aggregator = None
+    _state = None
+
+    @classmethod
+    def emit(cls, *event):
+        """
+        Records an event. It does nothing if the telemetry isn't started.
+
+        Parameters
+        ----------
+        *event
+            Event kind followed by its values, e.g. ("finished", nodeid).
+        """
+        if cls.enabled:
+            cls._events.append(event)
+
+    @classmethod
+    def start(cls, port=0, host="127.0.0.1"):
+        """
+        Starts the aggregation thread and the HTTP endpoint.
+
+        Parameters
+        ----------
+        port : int, optional
+            Port of the endpoint, 0 to pick a free one (default is 0).
+        host : str, optional
+            Address of the endpoint (default is "127.0.0.1").
+
+        Returns
+        -------
+        str
+            URL of the endpoint.
+        """
+        cls._state = {
+            "start_time": time.time(),
+            "counters": {"collected": 0, "started": 0, "finished": 0, "passed": 0, "failed": 0,
+                         "skipped": 0, "errors": 0},
+            "in_flight": {},
+            "commands": {},
+        }
+        try:
+            cls._server = ThreadingHTTPServer((host, port), TelemetryRequestHandler)
+        except OSError as e:
+            raise TelemetryError(f"Unable to start telemetry endpoint on {host}:{port}") from e
+        cls._server.daemon_threads = True
+        cls._stop.clear()
+        cls._aggregator = threading.Thread(target=cls._aggregate_loop, name="telemetry-aggregator", daemon=True)
+        cls._aggregator.start()
+        threading.Thread(target=cls._server.serve_forever, name="telemetry-server", daemon=True).start()
+        cls.enabled = True
+        return f"http://{host}:{cls._server.server_address[1]}"
+
+    @classmethod
+    def stop(cls):
+        """
+        Stops the HTTP endpoint and the aggregation thread.
+        """
+        if not cls.enabled:
+            return
+        cls.enabled = False
+        cls._stop.set()
+        cls._server.shutdown()
+        cls._server.server_close()
+        cls._aggregator.join()
+
+    @classmethod
+    def _aggregate_loop(cls):
+        """
+        Drains the events every aggregation interval until stopped.
+        """
+        while not cls._stop.wait(cls.AGGREGATION_INTERVAL):
+            cls.aggregate()
+
+    @classmethod
+    def aggregate(cls):
+        """
+        Applies the pending events to the aggregates.
+        """
+        with cls._lock:
+            state = cls._state
+            while cls._events:
+                event = cls._events.popleft()
+                kind = event[0]
+                if kind == "collected":
+                    state["counters"]["collected"] = event[1]
+                elif kind == "started":
+                    state["counters"]["started"] += 1
+                    state["in_flight"][event[1]] = {"device": None, "start_time": event[2]}
+                elif kind == "device":
+                    if event[1] in state["in_flight"]:
+                        state["in_flight"][event[1]]["device"] = event[2]
+                elif kind == "outcome":
+                    state["counters"][event[1]] += 1
+                elif kind == "finished":
+                    state["counters"]["finished"] += 1
+                    state["in_flight"].pop(event[1], None)
+                elif kind == "command":
+                    cls._add_command(state["commands"], event[1], event[2], event[3])
+
+    @classmethod
+    def _add_command(cls, commands, method, url, elapsed):
+        """
+        Adds a command latency to the histogram of its command name.
+        """
+        if cls.SESSION_PATH.match(url):
+            path = cls.ELEMENT_ID.sub("/element/:id", cls.SESSION_PATH.sub("/", url, count=1))
+        else:
+            path = f"/{url.rstrip('/').rsplit('/', 1)[-1]}"
+        name = f"{method} {path}"
+        if name not in commands and len(commands) >= cls.MAX_COMMANDS:
+            name = "other"
+        histogram = commands.setdefault(name, {"count": 0, "total_ms": 0.0, "max_ms": 0.0,
+                                               "buckets": [0] * len(cls.LATENCY_BUCKETS)})
+        latency = elapsed * 1000
+        histogram["count"] += 1
+        histogram["total_ms"] += latency
+        histogram["max_ms"] = max(histogram["max_ms"], latency)
+        histogram["buckets"][bisect.bisect_left(cls.LATENCY_BUCKETS, latency)] += 1
+
+    @classmethod
+    def percentile(cls, histogram, quantile):
+        """
+        Estimates a quantile of a latency histogram, interpolating inside its bucket.
+
+        Parameters
+        ----------
+        histogram : dict
+            The histogram of a command, with its `buckets` counts, `count` and `max_ms`.
+        quantile : float
+            The quantile, between 0 and 1.
+
+        Returns
+        -------
+        float
+            The estimated latency in milliseconds, never above the slowest command.
+        """
+        rank = quantile * histogram["count"]
+        cumulative = 0
+        lower = 0
+        for upper, bucket_count in zip(cls.LATENCY_BUCKETS, histogram["buckets"]):
+            if bucket_count and cumulative + bucket_count >= rank:
+                estimate = lower + (min(upper, histogram["max_ms"]) - lower) * (rank - cumulative) / bucket_count
+                return round(min(estimate, histogram["max_ms"]), 1)
+            cumulative += bucket_count
+            lower = upper
+        return round(histogram["max_ms"], 1)
+
+    @classmethod
+    def snapshot(cls):
+        """
+        Returns the current aggregates.
+
+        Returns
+        -------
+        dict
+            Test counters, `queue_depth` (tests not finished yet), in-flight tests per device,
+            latency percentiles per command and the backlog of events not aggregated yet.
+        """
+        cls.aggregate()
+        with cls._lock:
+            state = cls._state
+            now = time.time()
+            in_flight = {}
+            for nodeid, test in state["in_flight"].items():
+                in_flight.setdefault(test["device"] or "unassigned", []).append(
+                    {"test": nodeid, "running_s": round(now - test["start_time"], 1)})
+            commands = {}
+            for name, histogram in state["commands"].items():
+                count = histogram["count"]
+                commands[name] = {
+                    "count": count,
+                    "mean_ms": round(histogram["total_ms"] / count, 1),
+                    "p50_ms": cls.percentile(histogram, 0.5),
+                    "p90_ms": cls.percentile(histogram, 0.9),
+                    "p99_ms": cls.percentile(histogram, 0.99),
+                    "max_ms": round(histogram["max_ms"], 1),
+                }
+            counters = dict(state["counters"])
+            return {
+                "elapsed_s": round(now - state["start_time"], 1),
+                "counters": counters,
+                "queue_depth": max(counters["collected"] - counters["finished"], 0),
+                "in_flight": in_flight,
+                "commands": commands,
+                "event_backlog": len(cls._events),
+            }
+
+
+class TelemetryRequestHandler(BaseHTTPRequestHandler):
+    """
+    HTTP handler of the telemetry endpoints.
+    """
+    def do_GET(self):
+        """
+        Serves `/metrics` and `/stream`.
+        """
+        if self.path == "/metrics":
+            body = json.dumps(Telemetry.snapshot()).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        elif self.path == "/stream":
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            try:
+                while Telemetry.enabled:
+                    self.wfile.write(f"data: {json.dumps(Telemetry.snapshot())}\n\n".encode("utf-8"))
+                    self.wfile.flush()
+                    time.sleep(Telemetry.STREAM_INTERVAL)
+            except (BrokenPipeError, ConnectionResetError):
+                # The dashboard closed the stream
+                pass
+        else:
+            self.send_error(404, "Available endpoints: /metrics, /stream")
+
+    def log_message(self, format, *args):
+        """
+        Silences the request logs, which would be mixed with the test output.
+        """
@@ -0,0 +1,329 @@
+import io
+import os
+import json
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from PIL import Image
+
+from utils.file_manager import FileManager
+from utils.logger import Logger
+
+
+class VisualComparatorError(Exception):
+    """
+    Custom exception for VisualComparator errors.
+    Used to handle specific issues related to the screenshot comparison.
+    """
+
+
+class VisualComparator:
+    """
+    Compares screenshots against stored baselines.
+
+    Baselines are stored as PNG files in `data/baselines/<name>/`. A folder may hold
+    several variants of the same screen (e.g. one per resolution or theme); the
+    perceptual hash of every variant is kept in `index.json`, so the closest baseline
+    is selected without decoding any PNG. Decoded baselines are kept in an LRU cache
+    bounded by their total size in bytes.
+
+    Baselines are only recorded when `update_baselines` is enabled (`--update-baselines`);
+    otherwise a screen without a baseline for the screenshot resolution is an error.
+    """
+    BASELINE_DIR = "data/baselines/"
+    INDEX_FILE = "index.json"
+    # A 1080x2400 RGB baseline takes about 7.8 MB once decoded
+    CACHE_MAX_BYTES = 64 * 1024 * 1024
+    HASH_SIZE = 8
+    HASH_IMAGE_SIZE = 32
+
+    update_baselines = False
+
+    _indexes = {}
+    _lock = threading.Lock()
+    _cache = OrderedDict()
+    _cache_bytes = 0
+    _cache_lock = threading.Lock()
+
+    @staticmethod
+    def decode(png_bytes):
+        """
+        Decodes a PNG image into an RGB array.
+
+        Parameters
+        ----------
+        png_bytes : bytes
+            The PNG image content.
+
+        Returns
+        -------
+        numpy.ndarray
+            Array of shape (height, width, 3) and dtype uint8.
+        """
+        with Image.open(io.BytesIO(png_bytes)) as image:
+            return np.asarray(image.convert("RGB"))
+
+    @classmethod
+    def load_baseline(cls, path):
+        """
+        Returns a decoded baseline, from the LRU cache when possible.
+
+        The modification time is part of the cache key, so an updated baseline is decoded again.
+        The least recently used baselines are evicted once the cache exceeds `CACHE_MAX_BYTES`.
+
+        Parameters
+        ----------
+        path : str
+            Path to the baseline PNG file.
+
+        Returns
+        -------
+        numpy.ndarray
+            Read-only array of shape (height, width, 3) and dtype uint8.
+        """
+        key = (path, os.path.getmtime(path))
+        with cls._cache_lock:
+            if key in cls._cache:
+                cls._cache.move_to_end(key)
+                return cls._cache[key]
+
+        with Image.open(path) as image:
+            baseline = np.asarray(image.convert("RGB"))
+        # The cached array is shared by every comparison
+        baseline.flags.writeable = False
+
+        with cls._cache_lock:
+            if key not in cls._cache:
+                cls._cache[key] = baseline
+                cls._cache_bytes += baseline.nbytes
+            while cls._cache_bytes > cls.CACHE_MAX_BYTES and cls._cache:
+                _, evicted = cls._cache.popitem(last=False)
+                cls._cache_bytes -= evicted.nbytes
+        return baseline
+
+    @classmethod
+    def perceptual_hash(cls, image):
+        """
+        Computes the DCT perceptual hash of an image.
+
+        Parameters
+        ----------
+        image : numpy.ndarray
+            RGB image array.
+
+        Returns
+        -------
+        int
+            A 64 bits hash. Similar images have a small Hamming distance between their hashes.
+        """
+        size = cls.HASH_IMAGE_SIZE
+        gray = Image.fromarray(image).convert("L").resize((size, size), Image.Resampling.LANCZOS)
+        pixels = np.asarray(gray, dtype=np.float64)
+        dct_matrix = np.cos(np.pi * np.outer(np.arange(size), 2 * np.arange(size) + 1) / (2 * size))
+        low_frequencies = (dct_matrix @ pixels @ dct_matrix.T)[:cls.HASH_SIZE, :cls.HASH_SIZE].flatten()
+        bits = low_frequencies > np.median(low_frequencies[1:])
+        return int("".join("1" if bit else "0" for bit in bits), 2)
+
+    @classmethod
+    def get_index(cls, name):
+        """
+        Returns the perceptual hash index of the baselines stored for a screen.
+
+        The index is read from `index.json` and only the baselines added or modified since
+        it was written are decoded to compute their hash.
+
+        Parameters
+        ----------
+        name : str
+            Name of the screen baseline.
+
+        Returns
+        -------
+        dict
+            Baseline file name mapped to its `hash`, `width`, `height` and `mtime`.
+        """
+        with cls._lock:
+            if name in cls._indexes:
+                return cls._indexes[name]
+
+            baseline_dir = os.path.join(cls.BASELINE_DIR, name)
+            index_path = os.path.join(baseline_dir, cls.INDEX_FILE)
+            index = {}
+            if os.path.exists(index_path):
+                with open(index_path, "r") as f:
+                    index = json.load(f)
+
+            updated = False
+            files = sorted(f for f in os.listdir(baseline_dir) if f.endswith(".png")) if os.path.isdir(baseline_dir) else []
+            for file_name in files:
+                path = os.path.join(baseline_dir, file_name)
+                mtime = os.path.getmtime(path)
+                if file_name in index and index[file_name]["mtime"] == mtime:
+                    continue
+                baseline = cls.load_baseline(path)
+                index[file_name] = {
+                    "hash": f"{cls.perceptual_hash(baseline):016x}",
+                    "width": baseline.shape[1],
+                    "height": baseline.shape[0],
+                    "mtime": mtime,
+                }
+                updated = True
+            for file_name in set(index) - set(files):
+                del index[file_name]
+                updated = True
+
+            if updated:
+                with open(index_path, "w") as f:
+                    json.dump(index, f, indent=4)
+            cls._indexes[name] = index
+            return index
+
+    @classmethod
+    def find_baseline(cls, name, image):
+        """
+        Selects the baseline closest to an image among the variants of a screen.
+
+        Only variants with the same resolution are considered; among them, the one
+        with the smallest perceptual hash distance is returned.
+
+        Parameters
+        ----------
+        name : str
+            Name of the screen baseline.
+        image : numpy.ndarray
+            RGB image array.
+
+        Returns
+        -------
+        str or None
+            Path to the selected baseline, or None if there is no baseline for this resolution.
+        """
+        height, width = image.shape[:2]
+        candidates = {file_name: entry for file_name, entry in cls.get_index(name).items()
+                      if entry["width"] == width and entry["height"] == height}
+        if not candidates:
+            return None
+        image_hash = cls.perceptual_hash(image)
+        best = min(candidates, key=lambda file_name: bin(int(candidates[file_name]["hash"], 16) ^ image_hash).count("1"))
+        return os.path.join(cls.BASELINE_DIR, name, best)
+
+    @staticmethod
+    def diff_mask(image, baseline, ignore_regions=None, pixel_threshold=16):
+        """
+        Computes the mask of pixels that differ between two images.
+
+        Parameters
+        ----------
+        image : numpy.ndarray
+            RGB image array.
+        baseline : numpy.ndarray
+            RGB baseline array with the same shape as `image`.
+        ignore_regions : list of tuple, optional
+            Regions (x, y, width, height) excluded from the comparison.
+        pixel_threshold : int, optional
+            Maximum per channel difference for a pixel to be considered equal (default is 16).
+
+        Returns
+        -------
+        tuple
+            The boolean difference mask and the boolean mask of compared pixels.
+        """
+        if image.shape != baseline.shape:
+            raise VisualComparatorError(f"Image shape {image.shape} doesn't match baseline shape {baseline.shape}")
+        difference = np.abs(image.astype(np.int16) - baseline.astype(np.int16)).max(axis=2) > pixel_threshold
+        compared = np.ones(difference.shape, dtype=bool)
+        for x, y, width, height in ignore_regions or []:
+            compared[max(y, 0):y + height, max(x, 0):x + width] = False
+        return difference & compared, compared
+
+    @classmethod
+    def compare(cls, png_bytes, name, ignore_regions=None, pixel_threshold=16):
+        """
+        Compares a screenshot against the closest baseline of a screen.
+
+        When `update_baselines` is enabled, the screenshot is recorded instead: it replaces
+        the closest baseline of its resolution, or becomes a new variant of the screen.
+
+        Parameters
+        ----------
+        png_bytes : bytes
+            The screenshot PNG content.
+        name : str
+            Name of the screen baseline.
+        ignore_regions : list of tuple, optional
+            Regions (x, y, width, height) excluded from the comparison.
+        pixel_threshold : int, optional
+            Maximum per channel difference for a pixel to be considered equal (default is 16).
+
+        Returns
+        -------
+        dict
+            `baseline` path, `diff_ratio` (share of compared pixels that differ), `diff_pixels`,
+            the `image` array and its boolean `diff_mask`, and `new_baseline` set to True if the
+            baseline was just recorded.
+
+        Raises
+        ------
+        VisualComparatorError
+            If the screen has no baseline for the screenshot resolution and `update_baselines` is disabled.
+        """
+        image = cls.decode(png_bytes)
+        baseline_path = cls.find_baseline(name, image)
+        if cls.update_baselines:
+            baseline_path = cls.save_baseline(png_bytes, name, image, baseline_path)
+            Logger.get_logger().info(f"Recorded baseline {baseline_path}")
+            return {"baseline": baseline_path, "diff_ratio": 0.0, "diff_pixels": 0, "image": image,
+                    "diff_mask": np.zeros(image.shape[:2], dtype=bool), "new_baseline": True}
+        if baseline_path is None:
+            raise VisualComparatorError(
+                f"No baseline of '{name}' for resolution {image.shape[1]}x{image.shape[0]} in "
+                f"{os.path.join(cls.BASELINE_DIR, name)}, run with --update-baselines to record it")
+
+        difference, compared = cls.diff_mask(image, cls.load_baseline(baseline_path), ignore_regions, pixel_threshold)
+        diff_pixels = int(np.count_nonzero(difference))
+        compared_pixels = int(np.count_nonzero(compared))
+        diff_ratio = diff_pixels / compared_pixels if compared_pixels else 0.0
+        return {"baseline": baseline_path, "diff_ratio": diff_ratio, "diff_pixels": diff_pixels, "image": image,
+                "diff_mask": difference, "new_baseline": False}
+
+    @classmethod
+    def save_baseline(cls, png_bytes, name, image, baseline_path=None):
+        """
+        Stores a screenshot as a baseline of a screen.
+
+        Parameters
+        ----------
+        png_bytes : bytes
+            The screenshot PNG content.
+        name : str
+            Name of the screen baseline.
+        image : numpy.ndarray
+            The decoded screenshot.
+        baseline_path : str, optional
+            Baseline to replace (default is a new "<width>x<height>.png" baseline).
+
+        Returns
+        -------
+        str
+            Path to the baseline.
+        """
+        baseline_dir = os.path.join(cls.BASELINE_DIR, name)
+        os.makedirs(baseline_dir, exist_ok=True)
+        baseline_path = baseline_path or os.path.join(baseline_dir, f"{image.shape[1]}x{image.shape[0]}.png")
+        with open(baseline_path, "wb") as f:
+            f.write(png_bytes)
+        with cls._lock:
+            cls._indexes.pop(name, None)
+        return baseline_path
+
+    @staticmethod
+    def save_diff(image, difference, name):
+        """
+        Saves the screenshot with the differing pixels highlighted in the screenshots folder.
+        """
+        if not FileManager.SCREENSHOT_DIR:
+            return
+        highlighted = image.copy()
+        highlighted[difference] = (255, 0, 0)
+        Image.fromarray(highlighted).save(os.path.join(FileManager.SCREENSHOT_DIR, f"{name}-diff.png"))